@@ -0,0 +1,75 @@
+"""Initial schema: users, tasks, notifications
+
+Databases created before migrations existed (via create_all at startup)
+already have these tables, so each table is only created when missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+task_status = sa.Enum("NOT_STARTED", "IN_PROGRESS", "COMPLETED", name="taskstatus")
+task_priority = sa.Enum("LOW", "MEDIUM", "HIGH", name="taskpriority")
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "users" not in existing:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("hashed_password", sa.String(), nullable=False),
+            sa.Column("is_verified", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("verification_token", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_users_id", "users", ["id"])
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(), nullable=False),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("status", task_status, nullable=False),
+            sa.Column("priority", task_priority, nullable=False),
+            sa.Column("start_date", sa.DateTime(), nullable=True),
+            sa.Column("due_date", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+        op.create_index("ix_tasks_title", "tasks", ["title"])
+
+    if "notifications" not in existing:
+        op.create_table(
+            "notifications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id"), nullable=False),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("notification_type", sa.String(), nullable=False),
+            sa.Column("sent_at", sa.DateTime(), nullable=False),
+        )
+        op.create_index("ix_notifications_id", "notifications", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("notifications")
+    op.drop_table("tasks")
+    op.drop_table("users")
+    task_priority.drop(op.get_bind(), checkfirst=True)
+    task_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,34 @@
+"""Composite indexes for task listing, scheduler scans and notification lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_tasks_user_id_created_at", "tasks", ["user_id", "created_at"]),
+    ("ix_tasks_user_id_status_created_at", "tasks", ["user_id", "status", "created_at"]),
+    ("ix_tasks_user_id_due_date", "tasks", ["user_id", "due_date"]),
+    ("ix_tasks_status_due_date", "tasks", ["status", "due_date"]),
+    ("ix_notifications_task_id_notification_type", "notifications", ["task_id", "notification_type"]),
+]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        if name not in {index["name"] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
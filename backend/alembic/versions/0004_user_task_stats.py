@@ -0,0 +1,47 @@
+"""Per-user task aggregates for KPIs, plus indexes for the time-relative counts
+
+Rows are filled lazily on first use (or by `python -m app.manage rebuild-stats`).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+COUNTERS = [
+    "total_tasks",
+    "not_started_tasks",
+    "in_progress_tasks",
+    "completed_tasks",
+    "high_priority_tasks",
+    "medium_priority_tasks",
+    "low_priority_tasks",
+    "completion_days_total",
+    "completion_days_count",
+    "completed_with_due_date",
+    "completed_on_time",
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_task_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), primary_key=True),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in COUNTERS],
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_tasks_user_id_status_due_date", "tasks", ["user_id", "status", "due_date"])
+    op.create_index("ix_tasks_user_id_status_updated_at", "tasks", ["user_id", "status", "updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_user_id_status_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_user_id_status_due_date", table_name="tasks")
+    op.drop_table("user_task_stats")
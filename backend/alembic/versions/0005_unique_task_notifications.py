@@ -0,0 +1,43 @@
+"""Make (task_id, notification_type) unique on notifications
+
+Removes duplicate notification rows (keeping the earliest) before
+replacing the plain index with a unique one.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        DELETE FROM notifications
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM notifications GROUP BY task_id, notification_type
+        )
+        """
+    )
+    op.drop_index("ix_notifications_task_id_notification_type", table_name="notifications")
+    op.create_index(
+        "uq_notifications_task_id_notification_type",
+        "notifications",
+        ["task_id", "notification_type"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_notifications_task_id_notification_type", table_name="notifications")
+    op.create_index(
+        "ix_notifications_task_id_notification_type",
+        "notifications",
+        ["task_id", "notification_type"],
+    )
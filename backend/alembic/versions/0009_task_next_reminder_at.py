@@ -0,0 +1,36 @@
+"""Indexed next reminder time per task for the reminder dispatcher
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.add_column(sa.Column("next_reminder_at", sa.DateTime(), nullable=True))
+        batch_op.create_index("ix_tasks_next_reminder_at", ["next_reminder_at"])
+    
+    # Open tasks that aren't due yet: let the dispatcher work out their
+    # schedule on its first run (it only advances tasks with nothing due)
+    op.execute(
+        sa.text(
+            "UPDATE tasks SET next_reminder_at = :now "
+            "WHERE due_date > :now AND status IN ('NOT_STARTED', 'IN_PROGRESS')"
+        ).bindparams(now=datetime.utcnow())
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("tasks") as batch_op:
+        batch_op.drop_index("ix_tasks_next_reminder_at")
+        batch_op.drop_column("next_reminder_at")
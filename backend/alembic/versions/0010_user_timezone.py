@@ -0,0 +1,26 @@
+"""Per-user timezone for local-time daily reminders
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(sa.Column("timezone", sa.String(), server_default="UTC", nullable=False))
+        batch_op.create_index("ix_users_timezone", ["timezone"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_index("ix_users_timezone")
+        batch_op.drop_column("timezone")
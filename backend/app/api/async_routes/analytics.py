@@ -0,0 +1,46 @@
+"""
+Analytics API routes for KPIs and statistics (async stack, enabled by USE_ASYNC_DB)
+"""
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.services.async_service import AsyncAnalyticsService, AsyncTaskService
+from app.api.dependencies import get_current_user_id_async, get_async_read_db
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/kpis")
+async def get_kpis(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Get key performance indicators for tasks
+    
+    Returns:
+    - Total tasks
+    - Completed tasks
+    - In progress tasks
+    - Completion rate
+    - Average completion time
+    - Overdue tasks
+    - Tasks by priority
+    - Tasks by status
+    - This week's completed tasks
+    
+    Served from the per-user aggregates kept up to date by task writes, and
+    cached until the user's tasks change (or for at most RESPONSE_CACHE_KPI_TTL_SECONDS,
+    since overdue and this-week counts move with the clock)
+    """
+    version = await AsyncTaskService.get_data_version(db, user_id)
+    cached = response_cache.get(user_id, request, version)
+    if cached is not None:
+        return Response(cached, media_type="application/json")
+    
+    response = ORJSONResponse(await AsyncAnalyticsService.get_kpis(db, user_id))
+    response_cache.put(user_id, request, version, response.body, settings.RESPONSE_CACHE_KPI_TTL_SECONDS)
+    return response
@@ -0,0 +1,223 @@
+"""
+Authentication API routes (async stack, enabled by USE_ASYNC_DB)
+"""
+from fastapi import APIRouter, Depends, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_async_db
+from app.schemas.schemas import UserCreate, UserLogin, UserResponse, PasswordChange, EmailUpdate, TimezoneUpdate
+from app.services.async_service import AsyncAuthService
+from app.services.service import AuthService
+from app.api.dependencies import get_current_user_id_async
+from app.repositories.async_repository import AsyncUserRepository
+from app.core.security import verify_password_async, get_password_hash_async
+from app.core.token_cache import token_cache
+from app.core.cache import response_cache
+
+router = APIRouter(prefix="/auth", tags=["authentication"])
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register(
+    user: UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Register a new user
+    
+    - **email**: Valid email address
+    - **username**: Username (3-50 characters)
+    - **password**: Password (minimum 6 characters)
+    
+    Returns access token and user info
+    """
+    return await AsyncAuthService.register_user(db, user)
+
+
+@router.post("/login")
+async def login(
+    credentials: UserLogin,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Login with username and password
+    
+    - **username**: Username
+    - **password**: Password
+    
+    Returns access token and user info
+    """
+    return await AsyncAuthService.login_user(db, credentials)
+
+
+@router.get("/me", response_model=UserResponse)
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Get current authenticated user information
+    """
+    user = await AsyncAuthService.get_current_user(db, user_id)
+    return UserResponse.model_validate(user)
+
+
+@router.get("/users")
+async def get_all_users(
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get all registered users (for admin/analytics purposes)
+    Returns list of all users with basic info
+    TEMP: No authentication for debugging.
+    """
+    users = await AsyncUserRepository.get_all(db)
+    return {
+        "total_users": len(users),
+        "users": [
+            {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "is_verified": user.is_verified,
+                "created_at": user.created_at.isoformat(),
+            }
+            for user in users
+        ]
+    }
+
+
+@router.put("/change-password")
+async def change_password(
+    password_data: PasswordChange,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Change user password
+    Requires current password verification
+    """
+    user = await AsyncUserRepository.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Verify current password
+    if not await verify_password_async(password_data.current_password, user.hashed_password):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+    
+    # Update password
+    user.hashed_password = await get_password_hash_async(password_data.new_password)
+    await db.commit()
+    token_cache.invalidate_user(user_id)
+    
+    return {"message": "Password updated successfully"}
+
+
+@router.post("/verify-email")
+async def verify_email(
+    token: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Verify email address with token
+    """
+    user = await AsyncUserRepository.get_by_verification_token(db, token)
+    
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid or expired verification token")
+    
+    if user.is_verified:
+        return {"message": "Email already verified"}
+    
+    # Mark as verified
+    user.is_verified = 1
+    user.verification_token = None
+    await db.commit()
+    
+    return {"message": "Email verified successfully"}
+
+
+@router.post("/resend-verification")
+async def resend_verification(
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Resend verification email
+    """
+    user = await AsyncUserRepository.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if user.is_verified == 1:
+        raise HTTPException(status_code=400, detail="Email already verified")
+    
+    # New token and queued verification email, committed together
+    await db.run_sync(AuthService.queue_verification_email, user)
+    await db.commit()
+    
+    return {"message": "Verification email sent successfully"}
+
+
+@router.put("/update-email")
+async def update_email(
+    email_data: EmailUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Update user email and send verification
+    """
+    user = await AsyncUserRepository.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    # Check if email already exists
+    existing = await AsyncUserRepository.get_by_email(db, email_data.email)
+    if existing and existing.id != user_id:
+        raise HTTPException(status_code=400, detail="Email already in use")
+    
+    # Update email and set as unverified
+    user.email = email_data.email
+    user.is_verified = 0
+    await db.run_sync(AuthService.queue_verification_email, user)
+    await db.commit()
+    
+    return {"message": "Email updated. Please check your new email for verification link."}
+
+
+@router.put("/timezone")
+async def update_timezone(
+    timezone_data: TimezoneUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Set the user's timezone (IANA name, e.g. Europe/Berlin)
+    
+    Daily due-date reminders go out at 9 AM in this timezone
+    """
+    user = await AsyncUserRepository.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user.timezone = timezone_data.timezone
+    await db.commit()
+    
+    return {"message": "Timezone updated", "timezone": user.timezone}
+
+
+@router.delete("/delete-account")
+async def delete_account(
+    db: AsyncSession = Depends(get_async_db),
+    user_id: int = Depends(get_current_user_id_async)
+):
+    """
+    Delete user account and all associated data
+    """
+    # Delete user (cascade will delete all tasks)
+    if not await AsyncUserRepository.delete(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    token_cache.invalidate_user(user_id)
+    response_cache.invalidate_user(user_id)
+    
+    return {"message": "Account deleted successfully"}
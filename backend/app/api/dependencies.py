@@ -1,36 +1,56 @@
 """
 Dependencies for FastAPI routes
 """
+import secrets
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db, get_async_db, read_session, async_read_session
+from app.core.config import settings
 from app.core.security import decode_token
+from app.core.token_cache import token_cache
 from app.repositories.repository import UserRepository
+from app.repositories.async_repository import AsyncUserRepository
 
 # Security scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> int:
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> None:
     """
-    Dependency to get current authenticated user ID from JWT token
+    Allow only callers presenting METRICS_TOKEN
     
-    Args:
-        credentials: HTTP Bearer token credentials
-        db: Database session
-        
-    Returns:
-        User ID from token
-        
     Raises:
-        HTTPException: If token is invalid or user not found
+        HTTPException: 404 when METRICS_TOKEN is unset (the endpoint is
+        disabled), 401 for a missing or wrong token
     """
-    token = credentials.credentials
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+def _decode_user_id(token: str) -> tuple[int, dict]:
+    """
+    Decode a JWT and extract the user ID
     
+    Returns:
+        Tuple of (user ID, token payload)
+    
+    Raises:
+        HTTPException: If token is invalid or has no subject
+    """
     # Decode token
     payload = decode_token(token)
     if not payload:
@@ -49,12 +69,93 @@ def get_current_user_id(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
+    return int(user_id), payload
+
+
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="User not found"
+    )
+
+
+def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> int:
+    """
+    Dependency to get current authenticated user ID from JWT token
+    
+    Tokens verified recently are served from the in-process token cache
+    without decoding or touching the database.
+    
+    Args:
+        credentials: HTTP Bearer token credentials
+        db: Database session
+    
+    Returns:
+        User ID from token
+    
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    token = credentials.credentials
+    
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+    
+    user_id, payload = _decode_user_id(token)
+    
     # Verify user exists
-    user = UserRepository.get_by_id(db, int(user_id))
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    if not UserRepository.get_by_id(db, user_id):
+        raise _user_not_found()
+    
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
+
+
+async def get_current_user_id_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> int:
+    """
+    Async variant of get_current_user_id for the async route handlers
+    """
+    token = credentials.credentials
+    
+    cached_user_id = token_cache.get(token)
+    if cached_user_id is not None:
+        return cached_user_id
+    
+    user_id, payload = _decode_user_id(token)
+    
+    # Verify user exists
+    if not await AsyncUserRepository.get_by_id(db, user_id):
+        raise _user_not_found()
     
-    return int(user_id)
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
+
+
+def get_read_db(user_id: int = Depends(get_current_user_id)):
+    """
+    Dependency that provides a session for read-only routes
+    
+    Bound to the read replica (DATABASE_REPLICA_URL) when one is configured,
+    except for users who wrote within the last REPLICA_STICKY_SECONDS, whose
+    reads stay on the primary so they see their own changes.
+    """
+    db = read_session(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(user_id: int = Depends(get_current_user_id_async)):
+    """
+    Async variant of get_read_db
+    """
+    async with async_read_session(user_id) as db:
+        yield db
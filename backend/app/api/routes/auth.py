@@ -4,13 +4,13 @@ Authentication API routes
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.orm import Session
 from app.db.database import get_db
-from app.schemas.schemas import UserCreate, UserLogin, UserResponse, PasswordChange, EmailUpdate
+from app.schemas.schemas import UserCreate, UserLogin, UserResponse, PasswordChange, EmailUpdate, TimezoneUpdate
 from app.services.service import AuthService
 from app.api.dependencies import get_current_user_id
 from app.repositories.repository import UserRepository
 from app.core.security import verify_password, get_password_hash
-from app.core.email import EmailService
-import secrets
+from app.core.token_cache import token_cache
+from app.core.cache import response_cache
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -107,6 +107,7 @@ def change_password(
     # Update password
     user.hashed_password = get_password_hash(password_data.new_password)
     db.commit()
+    token_cache.invalidate_user(user_id)
     
     return {"message": "Password updated successfully"}
 
@@ -144,9 +145,6 @@ def resend_verification(
     """
     Resend verification email
     """
-    from app.models.models import User
-    from app.core.config import settings
-    
     user = UserRepository.get_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -154,26 +152,10 @@ def resend_verification(
     if user.is_verified == 1:
         raise HTTPException(status_code=400, detail="Email already verified")
     
-    # Generate new token
-    verification_token = secrets.token_urlsafe(32)
-    user.verification_token = verification_token
+    # New token and queued verification email, committed together
+    AuthService.queue_verification_email(db, user)
     db.commit()
     
-    # Send verification email
-    try:
-        EmailService.initialize()
-        verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
-        success = EmailService.send_verification_email(
-            to_email=user.email,
-            username=user.username,
-            verification_link=verification_link
-        )
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to send verification email")
-    except Exception as e:
-        print(f"Error sending verification email: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to send verification email")
-    
     return {"message": "Verification email sent successfully"}
 
 
@@ -186,9 +168,6 @@ def update_email(
     """
     Update user email and send verification
     """
-    from app.models.models import User
-    from app.core.config import settings
-    
     user = UserRepository.get_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -201,22 +180,33 @@ def update_email(
     # Update email and set as unverified
     user.email = email_data.email
     user.is_verified = 0
-    verification_token = secrets.token_urlsafe(32)
-    user.verification_token = verification_token
+    AuthService.queue_verification_email(db, user)
     db.commit()
     
-    # Send verification email
-    EmailService.initialize()
-    verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
-    EmailService.send_verification_email(
-        to_email=user.email,
-        username=user.username,
-        verification_link=verification_link
-    )
-    
     return {"message": "Email updated. Please check your new email for verification link."}
 
 
+@router.put("/timezone")
+def update_timezone(
+    timezone_data: TimezoneUpdate,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Set the user's timezone (IANA name, e.g. Europe/Berlin)
+    
+    Daily due-date reminders go out at 9 AM in this timezone
+    """
+    user = UserRepository.get_by_id(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user.timezone = timezone_data.timezone
+    db.commit()
+    
+    return {"message": "Timezone updated", "timezone": user.timezone}
+
+
 @router.delete("/delete-account")
 def delete_account(
     db: Session = Depends(get_db),
@@ -234,5 +224,7 @@ def delete_account(
     # Delete user (cascade will delete all tasks)
     db.delete(user)
     db.commit()
+    token_cache.invalidate_user(user_id)
+    response_cache.invalidate_user(user_id)
     
     return {"message": "Account deleted successfully"}
@@ -0,0 +1,30 @@
+"""
+Dashboard API route: everything the dashboard needs in one request
+"""
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from app.services.service import DashboardService
+from app.api.dependencies import get_current_user_id, get_read_db
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+@router.get("")
+def get_dashboard(
+    slices: str = Query(DashboardService.DEFAULT_SLICES, description="Comma-separated task slices"),
+    limit: int = Query(5, ge=1, le=50, description="Tasks per slice"),
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Get the current user, KPIs and task slices in one response
+    
+    - **slices**: Any of recent, due_soon, overdue, in_progress, recently_completed (default: recent,due_soon)
+    - **limit**: Tasks per slice (default: 5, max: 50)
+    
+    Returns `user` (as /auth/me), `kpis` (as /analytics/kpis) and `slices`
+    mapping each requested slice name to its tasks
+    """
+    content = DashboardService.get_dashboard(db, user_id, DashboardService.parse_slices(slices), limit)
+    return ORJSONResponse(content)
@@ -1,14 +1,16 @@
 """
 Task API routes
 """
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Header, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Optional, List
 from app.db.database import get_db
-from app.schemas.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
+from app.schemas.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse, TaskBatchResponse, BulkRequest, BulkResponse
 from app.services.service import TaskService
-from app.api.dependencies import get_current_user_id
+from app.api.dependencies import get_current_user_id, get_read_db
 from app.models.models import TaskStatus, TaskPriority
+from app.core.cache import response_cache
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -31,16 +33,41 @@ def create_task(
     return TaskService.create_task(db, task, user_id)
 
 
+@router.post("/bulk", response_model=BulkResponse)
+def bulk_write(
+    request: BulkRequest,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Create, update and delete many tasks in one transaction
+    
+    - **operations**: Up to 500 of `{"op": "create", "task": {...}}`,
+      `{"op": "update", "id": 1, "changes": {...}}` or `{"op": "delete", "id": 1}`
+    
+    Returns one result per operation, in request order, with an HTTP-style
+    `status` (201 created, 200 updated/deleted, 404 not found, 409 when the
+    same task id appears in more than one operation)
+    """
+    return TaskService.bulk_write(db, user_id, request.operations)
+
+
 @router.get("/", response_model=TaskListResponse)
 def get_tasks(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     search: Optional[str] = Query(None, description="Search in title and description"),
     status: Optional[TaskStatus] = Query(None, description="Filter by status"),
     priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
-    sort_by: str = Query("created_at", description="Sort by field (created_at, due_date, priority, status)"),
+    sort_by: Optional[str] = Query(None, description="Sort by field (created_at, due_date, priority, status, relevance)"),
     sort_order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    include_total: bool = Query(True, description="Count matching tasks (set false to skip the count)"),
+    highlight: bool = Query(False, description="Include highlighted search snippets"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return (default: all)"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """
@@ -51,10 +78,28 @@ def get_tasks(
     - **search**: Search query for title/description
     - **status**: Filter by status
     - **priority**: Filter by priority
-    - **sort_by**: Sort field (created_at, due_date, priority, status)
+    - **sort_by**: Sort field (created_at, due_date, priority, status, relevance); defaults to relevance when searching, otherwise created_at
     - **sort_order**: Sort order (asc or desc)
+    - **cursor**: Keyset cursor; when set, `page` is ignored and latency stays flat for deep pages
+    - **include_total**: Set false to skip counting (e.g. when the client cached the total)
+    - **highlight**: Add a `snippet` with matched search terms wrapped in `<mark>`
+    - **fields**: Only read and return these task fields (plus `id`), e.g. `title,status,due_date`
+    
+    Responses carry an ETag that changes whenever any of the user's tasks
+    change; send it back as `If-None-Match` to get an empty 304 instead.
+    Rendered pages are cached per user until their tasks change.
     """
-    return TaskService.get_tasks(
+    version = TaskService.get_data_version(db, user_id)
+    etag = TaskService.list_etag(user_id, version, request.url.query)
+    if TaskService.etag_matches(if_none_match, etag):
+        return TaskService.not_modified(etag)
+    
+    headers = {"ETag": etag, "Cache-Control": TaskService.CACHE_CONTROL}
+    cached = response_cache.get(user_id, request, version)
+    if cached is not None:
+        return Response(cached, media_type="application/json", headers=headers)
+    
+    content = TaskService.get_tasks(
         db=db,
         user_id=user_id,
         page=page,
@@ -63,26 +108,81 @@ def get_tasks(
         status_filter=status,
         priority_filter=priority,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor,
+        include_total=include_total,
+        highlight=highlight,
+        fields=TaskService.parse_fields(fields)
+    )
+    response = ORJSONResponse(content, headers=headers)
+    response_cache.put(user_id, request, version, response.body)
+    return response
+
+
+@router.get("/batch", response_model=TaskBatchResponse)
+def get_tasks_by_ids(
+    ids: List[int] = Query([], description="Task IDs (repeat the parameter: ?ids=1&ids=2), at most 500"),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Get many tasks by ID in one request
+    
+    Returns one entry per requested id, in request order, with `found`
+    false (and no `task`) for ids that don't exist or belong to another user
+    """
+    return ORJSONResponse(TaskService.get_tasks_by_ids(db, ids, user_id))
+
+
+@router.get("/export")
+def export_tasks(
+    format: str = Query("csv", regex="^(csv|ndjson)$", description="Export format"),
+    search: Optional[str] = Query(None, description="Search in title and description"),
+    status: Optional[TaskStatus] = Query(None, description="Filter by status"),
+    priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
+    db: Session = Depends(get_read_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Download all matching tasks, newest first
+    
+    - **format**: csv (default) or ndjson (one task JSON object per line)
+    - **search**, **status**, **priority**: Same filters as the task list
+    
+    The file is streamed in pages, so large exports start immediately
+    """
+    return StreamingResponse(
+        TaskService.export_tasks(db, user_id, format, search, status, priority),
+        media_type=TaskService.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
     )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """
     Get a specific task by ID
+    
+    Answers `If-None-Match` with an empty 304 when the task is unchanged
     """
-    return TaskService.get_task(db, task_id, user_id)
+    task = TaskService.get_task(db, task_id, user_id)
+    etag = TaskService.task_etag(task["id"], task["updated_at"])
+    if TaskService.etag_matches(if_none_match, etag):
+        return TaskService.not_modified(etag)
+    return ORJSONResponse(task, headers={"ETag": etag, "Cache-Control": TaskService.CACHE_CONTROL})
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task(
     task_id: int,
     task_update: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
@@ -90,17 +190,25 @@ def update_task(
     Update a task
     
     All fields are optional - only provided fields will be updated
+    
+    Send the task's ETag as `If-Match` to get a 412 instead of overwriting
+    a change made since you fetched it
     """
-    return TaskService.update_task(db, task_id, user_id, task_update)
+    task = TaskService.update_task(db, task_id, user_id, task_update, if_match)
+    response.headers["ETag"] = TaskService.task_etag(task.id, task.updated_at)
+    return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
 def delete_task(
     task_id: int,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """
     Delete a task
+    
+    Send the task's ETag as `If-Match` to get a 412 if it changed since you fetched it
     """
-    return TaskService.delete_task(db, task_id, user_id)
+    return TaskService.delete_task(db, task_id, user_id, if_match)
@@ -0,0 +1,168 @@
+"""
+Per-user response cache for read endpoints
+
+Rendered JSON bodies are cached under the user, path and normalized query
+string, together with the user's data version (UserTaskStats.version, bumped
+by every task write). A cached body is only served while the stored version
+matches the current one, so writes invalidate without any explicit purge and
+reading the version is the only database work on a hit. Responses that also
+depend on the clock (KPIs) are cached with a short TTL.
+
+Storage is pluggable: ResponseCache handles keys, versions and counters, and
+a backend stores opaque entries. MemoryCacheBackend is a per-process LRU
+bounded by entry count and bytes; a network backend (e.g. Redis) only needs
+to implement the same get/set/delete_prefix/stats methods.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode
+from fastapi import Request
+from app.core.config import settings
+
+# Rough per-entry bookkeeping cost (key, tuple, OrderedDict node), in bytes
+_ENTRY_OVERHEAD = 200
+
+
+class MemoryCacheBackend:
+    """LRU of key -> (version, body), bounded by entries and total bytes"""
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[int, bytes, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[tuple[int, bytes]]:
+        """Return (version, body) for a key, or None if absent or expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+    
+    def set(self, key: str, version: int, body: bytes, ttl_seconds: Optional[int] = None) -> None:
+        """Store a body, evicting least recently used entries to stay within bounds"""
+        size = len(key) + len(body) + _ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, body, time.monotonic() + ttl, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def delete_prefix(self, prefix: str) -> None:
+        """Drop every entry whose key starts with `prefix`"""
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove(key)
+    
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key)[3]
+    
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class ResponseCache:
+    """Version-validated cache of rendered response bodies, keyed per user"""
+    
+    def __init__(self, backend: Optional[MemoryCacheBackend]):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    @staticmethod
+    def key(user_id: int, request: Request) -> str:
+        """Cache key: user, path and the query string with its parameters sorted"""
+        query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+        return f"{user_id}:{request.url.path}?{query}"
+    
+    def get(self, user_id: int, request: Request, version: int) -> Optional[bytes]:
+        """Return the cached body for this request if it was rendered at `version`"""
+        if not self.enabled:
+            return None
+        entry = self.backend.get(self.key(user_id, request))
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] != version:
+            self.stale += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+    
+    def put(
+        self,
+        user_id: int,
+        request: Request,
+        version: int,
+        body: bytes,
+        ttl_seconds: Optional[int] = None
+    ) -> None:
+        """Cache a body rendered at `version` (optionally expiring sooner than the default TTL)"""
+        if self.enabled:
+            self.backend.set(self.key(user_id, request), version, body, ttl_seconds)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached response for a user (e.g. on account deletion)"""
+        if self.enabled:
+            self.backend.delete_prefix(f"{user_id}:")
+    
+    def stats(self) -> dict:
+        """Hit/miss counters plus the backend's size and evictions"""
+        if not self.enabled:
+            return {"backend": None}
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+            **self.backend.stats(),
+        }
+
+
+def build_response_cache() -> ResponseCache:
+    """Create the response cache for RESPONSE_CACHE_BACKEND ("memory" or "none")"""
+    if settings.RESPONSE_CACHE_BACKEND == "none":
+        return ResponseCache(None)
+    if settings.RESPONSE_CACHE_BACKEND != "memory":
+        raise ValueError(
+            f"Unknown RESPONSE_CACHE_BACKEND {settings.RESPONSE_CACHE_BACKEND!r}; expected memory or none"
+        )
+    return ResponseCache(MemoryCacheBackend(
+        settings.RESPONSE_CACHE_MAX_ENTRIES,
+        settings.RESPONSE_CACHE_MAX_BYTES,
+        settings.RESPONSE_CACHE_TTL_SECONDS,
+    ))
+
+
+response_cache = build_response_cache()
@@ -2,7 +2,7 @@
 Pydantic settings for configuration management
 """
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -11,11 +11,54 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./tasks.db"
     
+    # Serve the task, auth and analytics APIs from async route handlers on an
+    # async engine (asyncpg for PostgreSQL, aiosqlite for SQLite)
+    USE_ASYNC_DB: bool = False
+    
+    # Engine profile (pool sizing and per-connection PRAGMAs/SETs): auto picks
+    # postgres, or sqlite-wal in production / sqlite-dev otherwise. The DB_POOL_*
+    # settings override the profile's pool parameters when set.
+    DB_PROFILE: str = "auto"
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    
+    # Optional read replica for task lists, exports, KPIs and the dashboard.
+    # After a user's write, their reads stay on the primary for this long.
+    DATABASE_REPLICA_URL: str = ""
+    REPLICA_STICKY_SECONDS: int = 5
+    
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production-minimum-32-characters-long"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours for production
     
+    # Password hashing: bcrypt cost, worker processes (0 = hash inline) and
+    # how many extra requests may queue before new ones get a 503
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 16
+    
+    # Verified-token cache (per process); set either to 0 to disable
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+    
+    # Per-user response cache for task lists and KPIs ("memory" or "none"),
+    # bounded by entries and bytes per process. Entries are dropped when the
+    # user's tasks change; KPIs also expire after their own TTL.
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_KPI_TTL_SECONDS: int = 60
+    
+    # Compress responses of at least this many bytes (0 = disabled)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    
+    # Bearer token for /metrics (cache and pool internals); unset = endpoint disabled
+    METRICS_TOKEN: str = ""
+    
     # CORS
     FRONTEND_URL: str = "http://localhost:3000"
     ALLOWED_ORIGINS: str = "http://localhost:3000,https://task-tracker-66mv.vercel.app,https://tasktrackerz.xyz,https://www.tasktrackerz.xyz"
@@ -25,8 +68,40 @@ class Settings(BaseSettings):
     
     # Email (Resend)
     RESEND_API_KEY: str = ""  # Set in environment variables
+    RESEND_API_URL: str = "https://api.resend.com"  # benchmarks.fake_resend for offline runs
     EMAIL_FROM: str = "Task Tracker <onboarding@resend.dev>"  # Update with your verified domain
     
+    # Email outbox delivery: poll interval, batch size, parallel sends,
+    # provider rate limit (sends/second, 0 = unlimited) and retry policy
+    OUTBOX_POLL_SECONDS: int = 5
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_CONCURRENCY: int = 4
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 2.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: int = 30
+    OUTBOX_RETRY_MAX_SECONDS: int = 3600
+    
+    # Run the scheduled jobs (reminders, email outbox) in the API processes.
+    # Set false when a separate `python -m app.worker` runs them. Either way,
+    # only the process holding the database lease runs jobs; it renews the
+    # lease every third of SCHEDULER_LEASE_SECONDS.
+    RUN_SCHEDULER: bool = True
+    SCHEDULER_LEASE_SECONDS: int = 60
+    
+    # How long before a task's due date reminders go out (d/h/m units), and
+    # how often the dispatcher sends the reminders whose time has come
+    REMINDER_LEAD_TIMES: str = "1d,1h,15m"
+    REMINDER_DISPATCH_SECONDS: int = 60
+    REMINDER_DISPATCH_BATCH_SIZE: int = 500
+    
+    # Local hour (in each user's timezone) the daily due-today / due-tomorrow
+    # digest goes out; users are processed in per-timezone buckets
+    DAILY_REMINDER_HOUR: int = 9
+    
+    # Send due-date reminders as one digest email per user (via the batch
+    # API) instead of one email per task
+    REMINDER_DIGESTS: bool = True
+    
     @property
     def is_production(self) -> bool:
         return self.ENVIRONMENT.lower() == "production"
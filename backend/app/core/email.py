@@ -2,8 +2,12 @@
 Email service using Resend
 """
 import resend
+import html
 from app.core.config import settings
-from typing import Optional
+from typing import List
+
+# Resend accepts at most this many emails per batch request
+BATCH_SIZE = 100
 
 
 class EmailService:
@@ -11,7 +15,8 @@ class EmailService:
     
     @staticmethod
     def initialize():
-        """Initialize Resend with API key"""
+        """Initialize Resend with API key and endpoint"""
+        resend.api_url = settings.RESEND_API_URL.rstrip("/")
         if settings.RESEND_API_KEY:
             resend.api_key = settings.RESEND_API_KEY
     
@@ -118,31 +123,31 @@ class EmailService:
             return False
     
     @staticmethod
-    def send_hourly_reminder(
+    def send_upcoming_reminder(
         to_email: str,
         username: str,
         task_title: str,
         due_datetime: str,
-        minutes_until_due: int
+        due_in: str
     ) -> bool:
         """
-        Send 1-hour reminder email
+        Send a reminder for one task coming due (`due_in` e.g. "15 minutes")
         Returns True if sent successfully
         """
         if not settings.RESEND_API_KEY:
-            print(f"⚠️  Email not sent (no API key): {task_title} hourly reminder to {to_email}")
+            print(f"⚠️  Email not sent (no API key): {task_title} reminder to {to_email}")
             return False
         
         try:
             subject = f"⏰ Task Due Soon: {task_title}"
             message = f"""
-            <h2>Hi {username},</h2>
-            <p>⚡ <strong>Urgent:</strong> Your task is due in approximately <strong>{minutes_until_due} minutes</strong>!</p>
+            <h2>Hi {html.escape(username)},</h2>
+            <p>⚡ Your task is due in approximately <strong>{due_in}</strong>!</p>
             <div style="background: #fef2f2; border-left: 4px solid #ef4444; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <h3 style="margin: 0 0 10px 0; color: #dc2626;">{task_title}</h3>
+                <h3 style="margin: 0 0 10px 0; color: #dc2626;">{html.escape(task_title)}</h3>
                 <p style="margin: 0; color: #991b1b;"><strong>Due at: {due_datetime}</strong></p>
             </div>
-            <p>This is your final reminder - make sure to complete it on time!</p>
+            <p>Make sure to complete it on time!</p>
             <p>Best regards,<br>Task Tracker Team</p>
             """
             
@@ -153,9 +158,113 @@ class EmailService:
                 "html": message
             })
             
-            print(f"✅ Hourly reminder sent: {subject} to {to_email}")
+            print(f"✅ Reminder sent: {subject} to {to_email}")
             return True
             
         except Exception as e:
-            print(f"❌ Failed to send hourly reminder to {to_email}: {str(e)}")
+            print(f"❌ Failed to send reminder to {to_email}: {str(e)}")
             return False
+    
+    @staticmethod
+    def build_due_digest(
+        to_email: str,
+        username: str,
+        due_today: List[dict],
+        due_tomorrow: List[dict]
+    ) -> dict:
+        """
+        Render one reminder email listing all of a user's tasks due today and tomorrow
+        
+        Each task is a dict with `title` and `due_date` (formatted).
+        Returns the email params for send_batch.
+        """
+        total = len(due_today) + len(due_tomorrow)
+        if due_today:
+            subject = f"⏰ {len(due_today)} task(s) due today" if total == len(due_today) else \
+                f"⏰ {len(due_today)} task(s) due today, {len(due_tomorrow)} tomorrow"
+        else:
+            subject = f"📅 {len(due_tomorrow)} task(s) due tomorrow"
+        
+        sections = ""
+        for heading, color, tasks in (
+            ("Due today", "#ef4444", due_today),
+            ("Due tomorrow", "#f59e0b", due_tomorrow)
+        ):
+            if not tasks:
+                continue
+            items = "".join(
+                f'<li style="margin: 0 0 8px 0;"><strong>{html.escape(task["title"])}</strong>'
+                f' <span style="color: {color};">({task["due_date"]})</span></li>'
+                for task in tasks
+            )
+            sections += f"""
+                <h3 style="margin: 20px 0 10px 0; color: {color};">{heading}</h3>
+                <ul style="background: #f3f4f6; padding: 20px 20px 12px 36px; border-radius: 8px;">{items}</ul>
+                """
+        
+        message = f"""
+            <h2>Hi {html.escape(username)},</h2>
+            <p>Here are your upcoming tasks:</p>
+            {sections}
+            <p>Plan ahead to complete them on time!</p>
+            <p>Best regards,<br>Task Tracker Team</p>
+            """
+        
+        return {"from": settings.EMAIL_FROM, "to": to_email, "subject": subject, "html": message}
+    
+    @staticmethod
+    def build_upcoming_digest(to_email: str, username: str, tasks: List[dict]) -> dict:
+        """
+        Render one reminder listing all of a user's tasks coming due
+        
+        Each task is a dict with `title`, `due_datetime` (formatted) and
+        `due_in` (e.g. "15 minutes"). Returns the email params for send_batch.
+        """
+        if len(tasks) == 1:
+            subject = f"⏰ Task Due Soon: {tasks[0]['title']}"
+        else:
+            subject = f"⏰ {len(tasks)} tasks due soon"
+        
+        items = "".join(
+            f'<li style="margin: 0 0 8px 0;"><strong style="color: #dc2626;">{html.escape(task["title"])}</strong>'
+            f' <span style="color: #991b1b;">due at {task["due_datetime"]}'
+            f' (in ~{task["due_in"]})</span></li>'
+            for task in tasks
+        )
+        message = f"""
+            <h2>Hi {html.escape(username)},</h2>
+            <p>⚡ These tasks are coming due:</p>
+            <ul style="background: #fef2f2; border-left: 4px solid #ef4444; padding: 20px 20px 12px 36px; border-radius: 8px;">{items}</ul>
+            <p>Make sure to complete them on time!</p>
+            <p>Best regards,<br>Task Tracker Team</p>
+            """
+        
+        return {"from": settings.EMAIL_FROM, "to": to_email, "subject": subject, "html": message}
+    
+    @staticmethod
+    def send_batch(emails: List[dict]) -> List[bool]:
+        """
+        Send many emails with Resend's batch API (one request per BATCH_SIZE emails)
+        
+        Returns a success flag per email, in order. A failed request marks
+        its whole chunk as not sent so it is retried on the next run.
+        """
+        if not emails:
+            return []
+        
+        if not settings.RESEND_API_KEY:
+            print(f"⚠️  {len(emails)} email(s) not sent (no API key)")
+            return [False] * len(emails)
+        
+        results = []
+        for start in range(0, len(emails), BATCH_SIZE):
+            chunk = emails[start:start + BATCH_SIZE]
+            try:
+                resend.Batch.send(chunk)
+                results.extend([True] * len(chunk))
+                print(f"✅ Batch sent: {len(chunk)} email(s)")
+            except Exception as e:
+                print(f"❌ Failed to send batch of {len(chunk)} email(s): {str(e)}")
+                results.extend([False] * len(chunk))
+        
+        return results
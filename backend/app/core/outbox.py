@@ -0,0 +1,140 @@
+"""
+Email outbox delivery
+
+Drains the `email_outbox` table in the background: claims due messages in
+batches, sends them through EmailService on a small thread pool under a
+shared rate limit and records the outcome. Failed sends are retried with
+exponential backoff until OUTBOX_MAX_ATTEMPTS, then marked failed.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+import random
+import threading
+import time
+from app.core.config import settings
+from app.core.email import EmailService
+from app.db.database import SessionLocal
+from app.models.models import OutboxStatus
+from app.repositories.repository import OutboxRepository
+
+# Outbox kind -> EmailService sender called as sender(to_email=..., **payload)
+SENDERS = {
+    "verification": EmailService.send_verification_email,
+}
+
+# How long a claimed message stays hidden from other workers while it is sent
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+class RateLimiter:
+    """Token bucket shared by the delivery threads (rate <= 0 disables it)"""
+    
+    def __init__(self, rate_per_second: float):
+        self.rate = rate_per_second
+        self.capacity = max(1.0, rate_per_second)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a send is allowed"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_rate_limiter = RateLimiter(settings.EMAIL_RATE_LIMIT_PER_SECOND)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.OUTBOX_CONCURRENCY),
+            thread_name_prefix="email-outbox"
+        )
+    return _executor
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter for the given number of failed attempts"""
+    delay = min(
+        settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1),
+        settings.OUTBOX_RETRY_MAX_SECONDS
+    )
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def _send(kind: str, to_email: str, payload: dict) -> Optional[str]:
+    """Send one message; returns None on success or an error description"""
+    sender = SENDERS.get(kind)
+    if sender is None:
+        return f"Unknown email kind: {kind}"
+    
+    _rate_limiter.acquire()
+    try:
+        if sender(to_email=to_email, **payload):
+            return None
+        return "Email was not accepted for delivery"
+    except Exception as e:
+        return str(e)
+
+
+def deliver_outbox():
+    """Send one batch of due outbox messages (scheduled job)"""
+    # Claimed rows are read after the claim commits; keep them loaded
+    db = SessionLocal(expire_on_commit=False)
+    
+    try:
+        messages = OutboxRepository.claim_due(db, settings.OUTBOX_BATCH_SIZE, CLAIM_LEASE)
+        if not messages:
+            return
+        
+        EmailService.initialize()
+        errors = list(_get_executor().map(
+            lambda message: _send(message.kind, message.to_email, message.payload),
+            messages
+        ))
+        
+        now = datetime.utcnow()
+        sent = 0
+        for message, error in zip(messages, errors):
+            if error is None:
+                message.status = OutboxStatus.SENT
+                message.sent_at = now
+                message.last_error = None
+                sent += 1
+            elif message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxStatus.FAILED
+                message.last_error = error[:500]
+            else:
+                message.next_attempt_at = now + retry_delay(message.attempts)
+                message.last_error = error[:500]
+        db.commit()
+        
+        print(f"📤 Email outbox: {sent}/{len(messages)} sent")
+    
+    except Exception as e:
+        print(f"❌ Error delivering email outbox: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+def shutdown_outbox_pool():
+    """Stop the delivery threads (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
@@ -0,0 +1,159 @@
+"""
+Due-date reminder schedule
+
+REMINDER_LEAD_TIMES (e.g. "1d,1h,15m") lists how long before a task's due
+date a reminder goes out. Task writes store the time of the task's next
+reminder in the indexed `tasks.next_reminder_at`, and the dispatcher job only
+reads rows whose time has come, sends the reminder for the latest lead time
+that has passed, and moves `next_reminder_at` on to the following one.
+
+The daily due-today / due-tomorrow digest goes out at DAILY_REMINDER_HOUR in
+each user's own timezone: a quarter-hourly job picks the timezones where it
+is that hour now and uses their local day boundaries. Quarter hours since
+the job's last recorded run are checked too, so a late or skipped run (a
+restart, a lease hand-over) still sends those timezones' digests.
+"""
+import re
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.config import settings
+
+_LEAD_TIME_PATTERN = re.compile(r"^(\d+)([mhd])$")
+_LEAD_TIME_UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_lead_times(spec: str) -> List[timedelta]:
+    """Parse a comma-separated list like "1d,1h,15m" into lead times, longest first"""
+    leads = set()
+    for part in spec.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        match = _LEAD_TIME_PATTERN.match(part)
+        if not match or int(match.group(1)) == 0:
+            raise ValueError(f"Invalid reminder lead time {part!r}; expected e.g. 1d, 2h or 15m")
+        leads.add(timedelta(**{_LEAD_TIME_UNITS[match.group(2)]: int(match.group(1))}))
+    return sorted(leads, reverse=True)
+
+
+LEAD_TIMES = parse_lead_times(settings.REMINDER_LEAD_TIMES)
+
+
+def reminder_type(lead: timedelta) -> str:
+    """Notification type recorded for a lead time: due_1_day, due_1_hour, due_15_minutes, ..."""
+    minutes = int(lead.total_seconds() // 60)
+    for unit, size in (("day", 1440), ("hour", 60), ("minute", 1)):
+        if minutes % size == 0:
+            count = minutes // size
+            return f"due_{count}_{unit}{'s' if count > 1 else ''}"
+
+
+def next_reminder_at(due_date: Optional[datetime], now: datetime) -> Optional[datetime]:
+    """
+    When the next reminder for a task due at `due_date` should go out
+    
+    If a lead time has already passed (e.g. a task created 30 minutes before
+    it is due), its reminder is due right away. None once the task is due.
+    Times are naive UTC; an aware `due_date` is converted.
+    """
+    if due_date is None or not LEAD_TIMES:
+        return None
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+    if due_date <= now:
+        return None
+    times = [due_date - lead for lead in LEAD_TIMES]
+    passed = [time for time in times if time <= now]
+    return passed[-1] if passed else times[0]
+
+
+def current_lead_time(due_date: datetime, now: datetime) -> Optional[timedelta]:
+    """The shortest lead time that has passed for `due_date` (None if none has, or it's due)"""
+    if due_date <= now:
+        return None
+    passed = [lead for lead in LEAD_TIMES if due_date - lead <= now]
+    return passed[-1] if passed else None
+
+
+def following_reminder_at(due_date: datetime, now: datetime) -> Optional[datetime]:
+    """The first reminder time for `due_date` still ahead of `now` (None if there is none)"""
+    upcoming = [due_date - lead for lead in LEAD_TIMES if due_date - lead > now]
+    return upcoming[0] if upcoming else None
+
+
+def describe_due_in(delta: timedelta) -> str:
+    """Human-readable time left, e.g. "45 minutes", "3 hours", "2 days" """
+    minutes = max(1, round(delta.total_seconds() / 60))
+    if minutes < 120:
+        return f"{minutes} minute{'s' if minutes > 1 else ''}"
+    if minutes < 48 * 60:
+        return f"{round(minutes / 60)} hours"
+    return f"{round(minutes / 1440)} days"
+
+
+def _utc_naive(when: datetime) -> datetime:
+    return when.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def to_local(when: datetime, timezone_name: str) -> datetime:
+    """Convert a naive UTC datetime to wall-clock time in `timezone_name`"""
+    try:
+        zone = ZoneInfo(timezone_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        zone = timezone.utc
+    return when.replace(tzinfo=timezone.utc).astimezone(zone)
+
+
+def quarter_hour(when: datetime) -> datetime:
+    """`when` floored to the quarter hour"""
+    return when.replace(minute=when.minute - when.minute % 15, second=0, microsecond=0)
+
+
+def digest_ticks(last_run: Optional[datetime], tick: datetime, catch_up: timedelta) -> List[datetime]:
+    """
+    The quarter-hour ticks after `last_run` up to and including `tick`
+    
+    Looks back at most `catch_up` (and only checks `tick` without a last
+    run), so a long outage doesn't send stale digests.
+    """
+    start = tick - catch_up + timedelta(minutes=15)
+    if last_run is None:
+        start = tick
+    elif last_run >= start:
+        start = quarter_hour(last_run) + timedelta(minutes=15)
+    ticks = []
+    while start <= tick:
+        ticks.append(start)
+        start += timedelta(minutes=15)
+    return ticks
+
+
+def daily_digest_windows(timezones: List[str], ticks, hour: int) -> Dict[tuple, List[str]]:
+    """
+    Group the timezones where one of `ticks` (naive UTC, on a quarter hour) is `hour`:00 local time
+    
+    `ticks` is one tick or a list of them. Keys are the local (today,
+    tomorrow, day after) midnights as naive UTC, so timezones sharing the
+    same day boundaries are queried together.
+    """
+    if isinstance(ticks, datetime):
+        ticks = [ticks]
+    windows = {}
+    for name in timezones:
+        try:
+            zone = ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            print(f"⚠️  Skipping unknown timezone {name!r}")
+            continue
+        for tick in ticks:
+            local = tick.replace(tzinfo=timezone.utc).astimezone(zone)
+            if local.hour != hour or local.minute != 0:
+                continue
+            today = local.date()
+            bounds = tuple(
+                _utc_naive(datetime.combine(today + timedelta(days=days), time.min, tzinfo=zone))
+                for days in (0, 1, 2)
+            )
+            windows.setdefault(bounds, []).append(name)
+    return windows
@@ -1,85 +1,197 @@
 """
 Background task scheduler for notifications
+
+Every process that starts the scheduler (API workers with RUN_SCHEDULER, or
+the standalone `python -m app.worker`) competes for one database lease; only
+the current holder runs the jobs, so N workers don't scan and send N times.
 """
+import functools
+import os
+import socket
+import uuid
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+from sqlalchemy import case
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal
-from app.models.models import Task, User, Notification, TaskStatus
+from app.models.models import Task
+from app.repositories.repository import NotificationRepository, LeaseRepository, UserRepository
 from app.core.email import EmailService
+from app.core.outbox import deliver_outbox
+from app.core.reminders import (
+    current_lead_time,
+    following_reminder_at,
+    reminder_type,
+    describe_due_in,
+    to_local,
+    daily_digest_windows,
+    digest_ticks,
+    quarter_hour,
+)
+from app.core.config import settings
+
+
+# Lease the scheduled jobs run under, and this process's identity as a holder
+LEASE_NAME = "scheduler"
+LEASE_HOLDER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Wait before retrying a lead-time reminder whose email failed
+REMINDER_RETRY_DELAY = timedelta(minutes=5)
+
+# Job name the daily digest records its runs under, and how far back a run catches up
+DIGEST_JOB = "due_date_notifications"
+DIGEST_CATCH_UP = timedelta(hours=24)
+
+
+def hold_lease() -> bool:
+    """Take or renew the scheduler lease; False if another process holds it"""
+    db: Session = SessionLocal()
+    try:
+        return LeaseRepository.acquire(
+            db, LEASE_NAME, LEASE_HOLDER, timedelta(seconds=settings.SCHEDULER_LEASE_SECONDS)
+        )
+    except Exception as e:
+        print(f"❌ Error acquiring scheduler lease: {str(e)}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
 
 
-def check_due_dates():
+def release_lease() -> None:
+    """Hand the scheduler lease back (on shutdown) so another process takes over at once"""
+    db: Session = SessionLocal()
+    try:
+        LeaseRepository.release(db, LEASE_NAME, LEASE_HOLDER)
+    except Exception as e:
+        print(f"❌ Error releasing scheduler lease: {str(e)}")
+    finally:
+        db.close()
+
+
+def _leader_only(job: Callable[[], None]) -> Callable[[], None]:
+    """Wrap a job so it only runs in the process holding the scheduler lease"""
+    @functools.wraps(job)
+    def run():
+        if hold_lease():
+            job()
+    return run
+
+
+def _send_digests(reminders: list, build_email: Callable[[list], dict]) -> list:
+    """
+    Send one email per user covering all of their reminders
+    
+    `build_email` renders the email for one user's reminders. Emails go out
+    through the batch API, so provider calls scale with users, not tasks.
+    Returns the reminders whose email was sent.
+    """
+    by_user = {}
+    for reminder in reminders:
+        by_user.setdefault(reminder.user_id, []).append(reminder)
+    
+    groups = list(by_user.values())
+    results = EmailService.send_batch([build_email(group) for group in groups])
+    
+    return [reminder for group, success in zip(groups, results) if success for reminder in group]
+
+
+def _due_digest(reminders: list) -> dict:
+    """Render a user's due-today / due-tomorrow digest"""
+    tasks = {"due_today": [], "due_1_day": []}
+    for reminder in reminders:
+        tasks[reminder.notification_type].append({
+            "title": reminder.title,
+            "due_date": to_local(reminder.due_date, reminder.timezone).strftime("%B %d, %Y")
+        })
+    return EmailService.build_due_digest(
+        to_email=reminders[0].email,
+        username=reminders[0].username,
+        due_today=tasks["due_today"],
+        due_tomorrow=tasks["due_1_day"]
+    )
+
+
+def _upcoming_digest(reminders: list, now: datetime) -> dict:
+    """Render a user's coming-due digest"""
+    return EmailService.build_upcoming_digest(
+        to_email=reminders[0].email,
+        username=reminders[0].username,
+        tasks=[
+            {
+                "title": reminder.title,
+                "due_datetime": to_local(reminder.due_date, reminder.timezone).strftime("%b %d, %I:%M %p"),
+                "due_in": describe_due_in(reminder.due_date - now)
+            }
+            for reminder in reminders
+        ]
+    )
+
+
+def check_due_dates(now: Optional[datetime] = None):
     """
     Check for tasks with upcoming due dates and send notifications
-    Runs daily at 9 AM
+    Runs every 15 minutes; each run handles the timezones where it is now
+    DAILY_REMINDER_HOUR, so every user gets the digest at that local hour
+    and the load is spread over the day. Timezones whose hour came at a
+    quarter hour since the last recorded run (up to DIGEST_CATCH_UP ago)
+    are handled too, so a late or skipped run doesn't drop their digest.
     """
-    print(f"🔔 Checking due dates at {datetime.now()}")
+    now = now or datetime.utcnow()
+    tick = quarter_hour(now)
     
     db: Session = SessionLocal()
     try:
+        ticks = digest_ticks(LeaseRepository.get_last_run(db, DIGEST_JOB), tick, DIGEST_CATCH_UP)
+        windows = daily_digest_windows(UserRepository.get_timezones(db), ticks, settings.DAILY_REMINDER_HOUR)
+        if not windows:
+            LeaseRepository.record_run(db, DIGEST_JOB, tick)
+            return
+        print(f"🔔 Checking due dates at {tick} UTC ({len(ticks)} tick(s)) for {sum(map(len, windows.values()))} timezone(s)")
         EmailService.initialize()
         
-        today = datetime.utcnow().date()
-        tomorrow = (datetime.utcnow() + timedelta(days=1)).date()
-        
-        # Get all incomplete tasks with due dates
-        tasks = db.query(Task).filter(
-            Task.status != TaskStatus.COMPLETED,
-            Task.due_date.isnot(None)
-        ).all()
-        
-        for task in tasks:
-            if not task.due_date:
-                continue
-                
-            due_date = task.due_date.date()
-            days_until_due = (due_date - today).days
-            
-            # Skip if due date is in the past or more than 1 day away
-            if days_until_due < 0 or days_until_due > 1:
-                continue
-            
-            # Determine notification type
-            if days_until_due == 0:
-                notification_type = "due_today"
-            else:  # days_until_due == 1
-                notification_type = "due_1_day"
-            
-            # Check if we already sent this notification
-            existing = db.query(Notification).filter(
-                Notification.task_id == task.id,
-                Notification.notification_type == notification_type
-            ).first()
-            
-            if existing:
-                continue  # Already notified
-            
-            # Get user email
-            user = db.query(User).filter(User.id == task.user_id).first()
-            if not user:
-                continue
-            
-            # Send notification
-            success = EmailService.send_due_date_reminder(
-                to_email=user.email,
-                username=user.username,
-                task_title=task.title,
-                due_date=task.due_date.strftime("%B %d, %Y"),
-                days_until_due=days_until_due
+        # Incomplete tasks due today or tomorrow (local days) that haven't been
+        # notified yet, one query per set of timezones sharing day boundaries
+        reminders = []
+        for (today, tomorrow, day_after), timezones in windows.items():
+            notification_type = case(
+                (Task.due_date < tomorrow, "due_today"),
+                else_="due_1_day"
             )
-            
-            if success:
-                # Record notification
-                notification = Notification(
-                    task_id=task.id,
-                    user_id=task.user_id,
-                    notification_type=notification_type
+            reminders += NotificationRepository.get_pending_reminders(
+                db, today, day_after, notification_type, timezones
+            )
+        
+        if settings.REMINDER_DIGESTS:
+            delivered = _send_digests(reminders, _due_digest)
+        else:
+            delivered = [
+                reminder for reminder in reminders
+                if EmailService.send_due_date_reminder(
+                    to_email=reminder.email,
+                    username=reminder.username,
+                    task_title=reminder.title,
+                    due_date=to_local(reminder.due_date, reminder.timezone).strftime("%B %d, %Y"),
+                    days_until_due=0 if reminder.notification_type == "due_today" else 1
                 )
-                db.add(notification)
-                db.commit()
+            ]
         
-        print(f"✅ Due date check completed")
+        # Record notifications
+        sent = [
+            {
+                "task_id": reminder.task_id,
+                "user_id": reminder.user_id,
+                "notification_type": reminder.notification_type
+            }
+            for reminder in delivered
+        ]
+        NotificationRepository.record_sent(db, sent)
+        LeaseRepository.record_run(db, DIGEST_JOB, tick)
+        
+        print(f"✅ Due date check completed ({len(sent)}/{len(reminders)} sent)")
         
     except Exception as e:
         print(f"❌ Error checking due dates: {str(e)}")
@@ -88,94 +200,138 @@ def check_due_dates():
         db.close()
 
 
-def check_hourly_reminders():
-    """
-    Check for tasks due in the next hour
-    Runs every hour
+def dispatch_reminders():
     """
-    print(f"⏰ Checking hourly reminders at {datetime.now()}")
+    Send the lead-time reminders whose time has come
+    Runs every REMINDER_DISPATCH_SECONDS
     
+    Reads only tasks with next_reminder_at <= now, sends each the reminder
+    for the shortest lead time that has passed, then moves next_reminder_at
+    to the following lead time. Failed sends are retried after
+    REMINDER_RETRY_DELAY.
+    """
     db: Session = SessionLocal()
     try:
-        EmailService.initialize()
-        
         now = datetime.utcnow()
-        one_hour_later = now + timedelta(hours=1)
+        rows = NotificationRepository.get_due_reminders(db, now, settings.REMINDER_DISPATCH_BATCH_SIZE)
+        if not rows:
+            return
+        EmailService.initialize()
         
-        # Get all incomplete tasks with due dates in the next hour
-        tasks = db.query(Task).filter(
-            Task.status != TaskStatus.COMPLETED,
-            Task.due_date.isnot(None),
-            Task.due_date >= now,
-            Task.due_date <= one_hour_later
-        ).all()
+        # Skip reminders already sent (e.g. by the daily digest, or before a crash)
+        already_sent = NotificationRepository.get_sent(db, [row.task_id for row in rows])
+        reminders = []
+        for row in rows:
+            lead = current_lead_time(row.due_date, now)
+            if lead is not None and (row.task_id, reminder_type(lead)) not in already_sent:
+                reminders.append(SimpleNamespace(**row._asdict(), notification_type=reminder_type(lead)))
         
-        for task in tasks:
-            # Check if we already sent 1-hour notification
-            existing = db.query(Notification).filter(
-                Notification.task_id == task.id,
-                Notification.notification_type == "due_1_hour"
-            ).first()
-            
-            if existing:
-                continue
-            
-            # Get user
-            user = db.query(User).filter(User.id == task.user_id).first()
-            if not user:
-                continue
-            
-            # Send notification
-            time_until = (task.due_date - now).total_seconds() / 60  # minutes
-            
-            success = EmailService.send_hourly_reminder(
-                to_email=user.email,
-                username=user.username,
-                task_title=task.title,
-                due_datetime=task.due_date.strftime("%I:%M %p"),
-                minutes_until_due=int(time_until)
-            )
-            
-            if success:
-                notification = Notification(
-                    task_id=task.id,
-                    user_id=task.user_id,
-                    notification_type="due_1_hour"
+        if settings.REMINDER_DIGESTS:
+            delivered = _send_digests(reminders, lambda group: _upcoming_digest(group, now))
+        else:
+            delivered = [
+                reminder for reminder in reminders
+                if EmailService.send_upcoming_reminder(
+                    to_email=reminder.email,
+                    username=reminder.username,
+                    task_title=reminder.title,
+                    due_datetime=to_local(reminder.due_date, reminder.timezone).strftime("%b %d, %I:%M %p"),
+                    due_in=describe_due_in(reminder.due_date - now)
                 )
-                db.add(notification)
-                db.commit()
+            ]
         
-        print(f"✅ Hourly reminder check completed")
+        delivered_ids = {reminder.task_id for reminder in delivered}
+        failed_ids = {reminder.task_id for reminder in reminders} - delivered_ids
+        schedule = {}
+        for row in rows:
+            next_at = following_reminder_at(row.due_date, now)
+            if row.task_id in failed_ids:
+                next_at = min(now + REMINDER_RETRY_DELAY, next_at or row.due_date)
+            schedule[row.task_id] = (row.next_reminder_at, next_at)
+        # Tasks rescheduled by a write since they were read keep the new schedule
+        rescheduled = NotificationRepository.reschedule(db, schedule)
+        
+        # Commits the new schedule together with the notification records
+        NotificationRepository.record_sent(db, [
+            {
+                "task_id": reminder.task_id,
+                "user_id": reminder.user_id,
+                "notification_type": reminder.notification_type
+            }
+            for reminder in delivered
+            if reminder.task_id in rescheduled
+        ])
+        db.commit()
+        
+        print(f"⏰ Reminder dispatch: {len(delivered)}/{len(reminders)} sent, {len(rescheduled)}/{len(rows)} task(s) rescheduled")
         
     except Exception as e:
-        print(f"❌ Error checking hourly reminders: {str(e)}")
+        print(f"❌ Error dispatching reminders: {str(e)}")
         db.rollback()
     finally:
         db.close()
 
 
-def start_scheduler():
-    """Start the background scheduler"""
-    scheduler = BackgroundScheduler()
+def start_scheduler(blocking: bool = False):
+    """
+    Start the scheduler (in a background thread, or blocking for app.worker)
+    
+    Jobs only run while this process holds the scheduler lease, which a
+    heartbeat job keeps renewing.
+    """
+    scheduler = BlockingScheduler() if blocking else BackgroundScheduler()
     
-    # Run daily at 9 AM for day-based notifications
+    # Take over the lease as soon as it is free, and keep it while alive
     scheduler.add_job(
-        check_due_dates,
+        hold_lease,
+        'interval',
+        seconds=max(1, settings.SCHEDULER_LEASE_SECONDS // 3),
+        id='scheduler_lease',
+        next_run_time=datetime.now(),
+        max_instances=1,
+        coalesce=True
+    )
+    
+    # Daily due-today / due-tomorrow digest at DAILY_REMINDER_HOUR in each user's timezone
+    scheduler.add_job(
+        _leader_only(check_due_dates),
         'cron',
-        hour=9,
-        minute=0,
-        id='due_date_notifications'
+        minute='*/15',
+        id=DIGEST_JOB,
+        max_instances=1,
+        coalesce=True,
+        # A late tick still runs (and catches up on the ones it missed)
+        misfire_grace_time=15 * 60
     )
     
-    # Run every hour for 1-hour reminders
+    # Lead-time reminders (REMINDER_LEAD_TIMES) as their time comes
     scheduler.add_job(
-        check_hourly_reminders,
+        _leader_only(dispatch_reminders),
         'interval',
-        hours=1,
-        id='hourly_reminders'
+        seconds=settings.REMINDER_DISPATCH_SECONDS,
+        id='reminder_dispatch',
+        max_instances=1,
+        coalesce=True
     )
     
+    # Drain the transactional email outbox
+    scheduler.add_job(
+        _leader_only(deliver_outbox),
+        'interval',
+        seconds=settings.OUTBOX_POLL_SECONDS,
+        id='email_outbox',
+        max_instances=1,
+        coalesce=True
+    )
+    
+    print(f"📅 Notification scheduler started as {LEASE_HOLDER} (daily at {settings.DAILY_REMINDER_HOUR}:00 local + reminder dispatch + email outbox)")
     scheduler.start()
-    print("📅 Notification scheduler started (daily at 9 AM + hourly checks)")
     
     return scheduler
+
+
+def stop_scheduler(scheduler) -> None:
+    """Stop the scheduler and release the lease if this process held it"""
+    if scheduler.running:
+        scheduler.shutdown()
+    release_lease()
@@ -1,26 +1,115 @@
 """
 Security utilities for authentication and authorization
 """
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional
+import multiprocessing
+import threading
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes with a different cost are flagged by needs_update()
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool has no free slot (mapped to 503)"""
+
+
+# bcrypt runs in a dedicated process pool so login bursts don't tie up the
+# request threadpool or the GIL. Slots bound the in-flight jobs (running plus
+# queued); a request that finds none fails fast instead of waiting.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(
+    max(1, settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE)
+)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def _run_hash_job(fn, *args):
+    """Run a bcrypt job in the pool (or inline when PASSWORD_HASH_WORKERS is 0)"""
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return _get_hash_pool().submit(fn, *args).result()
+    finally:
+        _hash_slots.release()
+
+
+async def _run_hash_job_async(fn, *args):
+    """Await a bcrypt job without blocking the event loop"""
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return await asyncio.to_thread(fn, *args)
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHasherBusy()
+    try:
+        return await asyncio.wrap_future(_get_hash_pool().submit(fn, *args))
+    finally:
+        _hash_slots.release()
+
+
+def shutdown_password_pool() -> None:
+    """Stop the password hashing worker processes"""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(cancel_futures=True)
+            _hash_pool = None
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
     # Truncate password to 72 bytes for bcrypt
-    return pwd_context.verify(plain_password[:72], hashed_password)
+    return _run_hash_job(_verify, plain_password[:72], hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
     # Truncate password to 72 bytes for bcrypt
-    return pwd_context.hash(password[:72])
+    return _run_hash_job(_hash, password[:72])
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password from async code"""
+    return await _run_hash_job_async(_verify, plain_password[:72], hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash from async code"""
+    return await _run_hash_job_async(_hash, password[:72])
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses a different bcrypt cost than BCRYPT_ROUNDS"""
+    return pwd_context.needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -0,0 +1,100 @@
+"""
+In-process cache of verified access tokens
+
+Maps a SHA-256 digest of the bearer token to the user ID it was verified
+for, so repeat requests skip JWT decoding and the user lookup. Entries
+expire after TOKEN_CACHE_TTL_SECONDS and never outlive the token's own
+`exp`. The cache is per process: invalidation (account deletion, password
+change) is immediate in the current worker and bounded by the TTL in others.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from app.core.config import settings
+
+
+class TokenCache:
+    """Bounded, TTL-limited LRU cache of token digest -> user ID"""
+    
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+    
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def get(self, token: str) -> Optional[int]:
+        """Return the cached user ID for a token, or None on a miss"""
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, token: str, user_id: int, token_exp: Optional[float] = None) -> None:
+        """
+        Cache a verified token
+        
+        Args:
+            token: The raw bearer token
+            user_id: User the token was verified for
+            token_exp: The token's `exp` claim (Unix time); caps the entry lifetime
+        """
+        if not self.enabled:
+            return
+        lifetime = self.ttl_seconds
+        if token_exp is not None:
+            lifetime = min(lifetime, token_exp - time.time())
+        if lifetime <= 0:
+            return
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (user_id, time.monotonic() + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached token for a user"""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry[0] == user_id]:
+                del self._entries[key]
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_TTL_SECONDS)
@@ -1,20 +1,202 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
 
+# Engine profiles: pool parameters, and settings applied to every new
+# connection (PRAGMAs on SQLite, SETs on PostgreSQL)
+ENGINE_PROFILES = {
+    # Local development on SQLite: default rollback journal, but wait for
+    # locks instead of failing straight away with "database is locked"
+    "sqlite-dev": {
+        "pool": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30},
+        "connect": {"busy_timeout": 5000},
+    },
+    # Production on SQLite: WAL lets readers run alongside the single writer,
+    # and synchronous=NORMAL is durable in WAL mode with far fewer fsyncs
+    "sqlite-wal": {
+        "pool": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 30},
+        "connect": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 15000,
+            "temp_store": "MEMORY",
+            "cache_size": -16000,
+        },
+    },
+    # PostgreSQL: reuse connections, drop ones the server or a proxy closed,
+    # and stop runaway queries from holding a pooled connection
+    "postgres": {
+        "pool": {
+            "pool_size": 10,
+            "max_overflow": 10,
+            "pool_timeout": 10,
+            "pool_recycle": 1800,
+            "pool_pre_ping": True,
+        },
+        "connect": {
+            "application_name": "'task-tracker'",
+            "statement_timeout": 30000,
+            "idle_in_transaction_session_timeout": 60000,
+        },
+    },
+}
+
+
+def engine_profile_name(url: str) -> str:
+    """The configured DB_PROFILE, or the default for the database URL and environment"""
+    if settings.DB_PROFILE != "auto":
+        if settings.DB_PROFILE not in ENGINE_PROFILES:
+            raise ValueError(
+                f"Unknown DB_PROFILE {settings.DB_PROFILE!r}; "
+                f"expected auto or one of {', '.join(ENGINE_PROFILES)}"
+            )
+        return settings.DB_PROFILE
+    if make_url(url).get_backend_name() == "sqlite":
+        return "sqlite-wal" if settings.is_production else "sqlite-dev"
+    return "postgres"
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    """Whether `url` is an in-memory SQLite database (which can't use a queue pool)"""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and (
+        parsed.database in (None, "", ":memory:") or parsed.query.get("mode") == "memory"
+    )
+
+
+def engine_options(url: str, profile: dict, is_async: bool = False) -> dict:
+    """create_engine() keyword arguments for `url` under an engine profile"""
+    options = {}
+    if make_url(url).get_backend_name() == "sqlite" and not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+    if _is_sqlite_memory(url):
+        return options
+    
+    pool = dict(profile["pool"])
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    pool.update((key, value) for key, value in overrides.items() if value is not None)
+    options.update(pool)
+    # aiosqlite defaults to opening a connection (and thread) per checkout
+    if is_async and make_url(url).get_backend_name() == "sqlite":
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def apply_connect_settings(engine: Engine, profile: dict) -> None:
+    """Run the profile's PRAGMAs / SETs on every new DBAPI connection"""
+    statement = "PRAGMA {} = {}" if engine.dialect.name == "sqlite" else "SET {} = {}"
+    statements = [statement.format(name, value) for name, value in profile["connect"].items()]
+    
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for sql in statements:
+            cursor.execute(sql)
+        cursor.close()
+        if engine.dialect.name != "sqlite":
+            # SETs run in the implicit transaction; keep them for the session
+            dbapi_connection.commit()
+
+
+def pool_stats() -> dict:
+    """Engine profile and connection pool counters for /metrics"""
+    stats = {"profile": DB_PROFILE, "sync": _pool_stats(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = _pool_stats(async_engine.pool)
+    if replica_engine is not None:
+        stats["replica"] = _pool_stats(replica_engine.pool)
+    if async_replica_engine is not None:
+        stats["async_replica"] = _pool_stats(async_replica_engine.pool)
+    return stats
+
+
+def _pool_stats(pool) -> dict:
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+
 # Create SQLAlchemy engine
+DB_PROFILE = engine_profile_name(settings.DATABASE_URL)
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    **engine_options(settings.DATABASE_URL, ENGINE_PROFILES[DB_PROFILE])
 )
+apply_connect_settings(engine, ENGINE_PROFILES[DB_PROFILE])
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica for the heavy read-only routes (see get_read_db)
+replica_engine = None
+ReadSessionLocal = SessionLocal
+
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        **engine_options(settings.DATABASE_REPLICA_URL, ENGINE_PROFILES[DB_PROFILE])
+    )
+    apply_connect_settings(replica_engine, ENGINE_PROFILES[DB_PROFILE])
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+# Read-your-writes: user id -> monotonic time until which their reads stay
+# on the primary. Per process, so it assumes a user's requests mostly reach
+# the same worker; otherwise reads may briefly lag behind their own writes.
+_sticky_users = {}
+_sticky_users_lock = threading.Lock()
+
+
+def mark_user_write(db: Session, user_id: int) -> None:
+    """Note that `db` wrote `user_id`'s data; once committed, their reads stick to the primary"""
+    if settings.DATABASE_REPLICA_URL:
+        db.info.setdefault("written_user_ids", set()).add(user_id)
+
+
+def reads_from_primary(user_id: int) -> bool:
+    """Whether `user_id` committed a write within the last REPLICA_STICKY_SECONDS"""
+    with _sticky_users_lock:
+        until = _sticky_users.get(user_id)
+        if until is not None and until <= time.monotonic():
+            del _sticky_users[user_id]
+            until = None
+    return until is not None
+
+
+@event.listens_for(Session, "after_commit")
+def _record_user_writes(session, *args):
+    user_ids = session.info.pop("written_user_ids", None)
+    if not user_ids:
+        return
+    until = time.monotonic() + settings.REPLICA_STICKY_SECONDS
+    with _sticky_users_lock:
+        for user_id in user_ids:
+            _sticky_users[user_id] = until
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_writes(session, *args):
+    session.info.pop("written_user_ids", None)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -29,3 +211,65 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def read_session(user_id: int) -> Session:
+    """A session on the replica, or on the primary if there is none or `user_id` just wrote"""
+    if replica_engine is None or reads_from_primary(user_id):
+        return SessionLocal()
+    return ReadSessionLocal()
+
+
+def async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver"""
+    scheme, _, rest = url.partition("://")
+    driver = {
+        "postgres": "postgresql+asyncpg",
+        "postgresql": "postgresql+asyncpg",
+        "postgresql+psycopg2": "postgresql+asyncpg",
+        "sqlite": "sqlite+aiosqlite",
+    }.get(scheme, scheme)
+    return f"{driver}://{rest}"
+
+
+# Async engines and session factories, only created when the async stack is enabled
+async_engine = None
+AsyncSessionLocal = None
+async_replica_engine = None
+AsyncReadSessionLocal = None
+
+if settings.USE_ASYNC_DB:
+    async_engine = create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        **engine_options(settings.DATABASE_URL, ENGINE_PROFILES[DB_PROFILE], is_async=True)
+    )
+    apply_connect_settings(async_engine.sync_engine, ENGINE_PROFILES[DB_PROFILE])
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    AsyncReadSessionLocal = AsyncSessionLocal
+    if settings.DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(
+            async_database_url(settings.DATABASE_REPLICA_URL),
+            **engine_options(settings.DATABASE_REPLICA_URL, ENGINE_PROFILES[DB_PROFILE], is_async=True)
+        )
+        apply_connect_settings(async_replica_engine.sync_engine, ENGINE_PROFILES[DB_PROFILE])
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+
+
+async def get_async_db():
+    """
+    Dependency that provides an async database session
+    Ensures proper cleanup after use
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def async_read_session(user_id: int) -> AsyncSession:
+    """Async variant of read_session"""
+    if async_replica_engine is None or reads_from_primary(user_id):
+        return AsyncSessionLocal()
+    return AsyncReadSessionLocal()
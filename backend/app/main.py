@@ -1,16 +1,29 @@
 """
 Main FastAPI application
 """
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
-from app.api.routes import tasks, auth, analytics, notifications
-from app.db.database import engine, Base
+from app.api.routes import notifications
 from app.core.config import settings
-from app.core.scheduler import start_scheduler
+from app.api.dependencies import require_metrics_token
+from app.db.database import async_engine, pool_stats
+from app.core.scheduler import start_scheduler, stop_scheduler
+from app.core.outbox import shutdown_outbox_pool
+from app.core.security import PasswordHasherBusy, shutdown_password_pool
+from app.core.token_cache import token_cache
+from app.core.cache import response_cache
+from app.core.compression import CompressionMiddleware
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Task, auth, analytics and dashboard routers run on the sync or the async database stack
+if settings.USE_ASYNC_DB:
+    from app.api.async_routes import tasks, auth, analytics, dashboard
+else:
+    from app.api.routes import tasks, auth, analytics, dashboard
+
+# Database schema is managed by Alembic: run `python -m app.manage migrate`
+# as a deploy step before starting the workers
 
 # Scheduler instance
 scheduler = None
@@ -20,12 +33,17 @@ scheduler = None
 async def lifespan(app: FastAPI):
     """Lifecycle manager for startup and shutdown events"""
     global scheduler
-    # Startup
-    scheduler = start_scheduler()
+    # Startup: API workers may leave the jobs to `python -m app.worker`
+    if settings.RUN_SCHEDULER:
+        scheduler = start_scheduler()
     yield
     # Shutdown
     if scheduler:
-        scheduler.shutdown()
+        stop_scheduler(scheduler)
+    shutdown_password_pool()
+    shutdown_outbox_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -34,6 +52,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs" if not settings.is_production else None,
     redoc_url="/api/redoc" if not settings.is_production else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -44,12 +63,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Compress larger responses (brotli when available and accepted, else gzip)
+if settings.COMPRESSION_MINIMUM_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """Fail fast when the password hashing pool is saturated"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 # Include routers
 app.include_router(auth.router, prefix="/api")
 app.include_router(tasks.router, prefix="/api")
 app.include_router(analytics.router, prefix="/api")
+app.include_router(dashboard.router, prefix="/api")
 app.include_router(notifications.router, prefix="/api")
 
 
@@ -73,6 +107,16 @@ def health_check():
     }
 
 
+@app.get("/metrics", dependencies=[Depends(require_metrics_token)], include_in_schema=False)
+def metrics():
+    """In-process counters for this worker (needs METRICS_TOKEN as a bearer token)"""
+    return {
+        "token_cache": token_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "database": pool_stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,67 @@
+"""
+Management commands
+
+Usage:
+    python -m app.manage migrate [revision]
+    python -m app.manage rebuild-stats [--user-id ID]
+"""
+import argparse
+from pathlib import Path
+from typing import Optional, Sequence
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def alembic_config() -> Config:
+    """Build the Alembic config independent of the current working directory"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    return config
+
+
+def migrate(revision: str = "head") -> None:
+    """Upgrade the database schema to the given revision"""
+    command.upgrade(alembic_config(), revision)
+
+
+def rebuild_stats(user_id: Optional[int] = None) -> None:
+    """Recompute per-user task aggregates to repair any drift"""
+    from app.db.database import SessionLocal
+    from app.repositories.repository import TaskStatsRepository
+    
+    db = SessionLocal()
+    try:
+        if user_id is None:
+            count = TaskStatsRepository.rebuild_all(db)
+            print(f"✅ Rebuilt task stats for {count} users")
+        else:
+            TaskStatsRepository.rebuild_user(db, user_id)
+            db.commit()
+            print(f"✅ Rebuilt task stats for user {user_id}")
+    finally:
+        db.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    
+    migrate_parser = subcommands.add_parser("migrate", help="Apply database migrations")
+    migrate_parser.add_argument("revision", nargs="?", default="head")
+    
+    stats_parser = subcommands.add_parser("rebuild-stats", help="Recompute per-user task aggregates")
+    stats_parser.add_argument("--user-id", type=int, default=None)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "migrate":
+        migrate(args.revision)
+    elif args.command == "rebuild-stats":
+        rebuild_stats(args.user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 """
 SQLAlchemy models for database tables
 """
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index, JSON, event
+from sqlalchemy.orm import relationship, object_session
 from datetime import datetime
 import enum
-from app.db.database import Base
+from app.db.database import Base, mark_user_write
 
 
 class TaskStatus(str, enum.Enum):
@@ -22,6 +22,13 @@ class TaskPriority(str, enum.Enum):
     HIGH = "High"
 
 
+class OutboxStatus(str, enum.Enum):
+    """Email outbox delivery status"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class User(Base):
     """User model for authentication"""
     __tablename__ = "users"
@@ -32,10 +39,21 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_verified = Column(Integer, default=0, nullable=False)  # 0 = not verified, 1 = verified
     verification_token = Column(String, nullable=True)
+    timezone = Column(String, default="UTC", nullable=False, index=True)  # IANA name; daily reminders go out at 9 AM here
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
     tasks = relationship("Task", back_populates="owner", cascade="all, delete-orphan")
+    task_stats = relationship("UserTaskStats", uselist=False, cascade="all, delete-orphan")
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_account_write(mapper, connection, user):
+    # Account changes (email, timezone, verification, ...) count as the
+    # user's writes too, so their next reads don't hit a lagging replica
+    mark_user_write(object_session(user), user.id)
 
 
 class Task(Base):
@@ -52,12 +70,30 @@ class Task(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    # When the next due-date reminder goes out (see app.core.reminders);
+    # NULL for completed tasks and tasks with nothing left to remind
+    next_reminder_at = Column(DateTime, nullable=True)
+    
     # Foreign key to user
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Relationships
     owner = relationship("User", back_populates="tasks")
     notifications = relationship("Notification", back_populates="task", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Task listing: filter by user (and optionally status), sort by date
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at"),
+        Index("ix_tasks_user_id_status_created_at", "user_id", "status", "created_at"),
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        # KPI range counts: overdue (open, past due) and recently completed
+        Index("ix_tasks_user_id_status_due_date", "user_id", "status", "due_date"),
+        Index("ix_tasks_user_id_status_updated_at", "user_id", "status", "updated_at"),
+        # Scheduler scans for incomplete tasks with an upcoming due date
+        Index("ix_tasks_status_due_date", "status", "due_date"),
+        # Reminder dispatcher: tasks whose next reminder time has come
+        Index("ix_tasks_next_reminder_at", "next_reminder_at"),
+    )
 
 
 class Notification(Base):
@@ -72,3 +108,99 @@ class Notification(Base):
     
     # Relationships
     task = relationship("Task", back_populates="notifications")
+    
+    __table_args__ = (
+        # One notification of each type per task; the scheduler anti-joins on
+        # it and relies on it to ignore duplicate inserts
+        Index("uq_notifications_task_id_notification_type", "task_id", "notification_type", unique=True),
+    )
+
+
+class UserTaskStats(Base):
+    """
+    Per-user task aggregates backing the KPI endpoint
+    
+    Maintained incrementally by TaskRepository writes in the same transaction
+    as the task change; `python -m app.manage rebuild-stats` recomputes them.
+    """
+    __tablename__ = "user_task_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Counts by status
+    not_started_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    in_progress_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    completed_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Counts by priority
+    high_priority_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    medium_priority_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    low_priority_tasks = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Completed tasks with a start date: sum of whole days from start to completion
+    completion_days_total = Column(Integer, default=0, server_default="0", nullable=False)
+    completion_days_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Completed tasks with a due date, and how many finished by it
+    completed_with_due_date = Column(Integer, default=0, server_default="0", nullable=False)
+    completed_on_time = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    # Bumped on every task write by this user; part of the task list ETag
+    version = Column(Integer, default=0, server_default="0", nullable=False)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class EmailOutbox(Base):
+    """
+    Outgoing email written in the same transaction as the change that triggers it
+    
+    Drained by the outbox delivery job (app.core.outbox), so HTTP requests
+    never wait on the email provider.
+    """
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # 'verification'
+    to_email = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)  # keyword arguments for the EmailService sender
+    status = Column(Enum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Delivery job picks up pending messages whose next attempt is due
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+
+class SchedulerLease(Base):
+    """
+    Named leader lease held by one process at a time
+    
+    The process holding the "scheduler" lease runs the background jobs; it
+    renews the lease while alive, and another process takes over once it expires.
+    """
+    __tablename__ = "scheduler_leases"
+    
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    acquired_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SchedulerJobRun(Base):
+    """
+    When a scheduled job last ran, by job name
+    
+    Lets a job that only acts at certain times (the daily digest) catch up
+    on the times it missed while no process was running it.
+    """
+    __tablename__ = "scheduler_job_runs"
+    
+    name = Column(String, primary_key=True)
+    last_run_at = Column(DateTime, nullable=False)
@@ -0,0 +1,138 @@
+"""
+Async repository layer for database operations
+
+Each method runs the matching sync repository method through
+`AsyncSession.run_sync`, which executes it in a greenlet on the async
+driver's connection: queries are awaited on the event loop while the
+query building, search and KPI aggregate logic stays in one place.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from app.models.models import Task, User, UserTaskStats
+from app.repositories.repository import TaskRepository, UserRepository, TaskStatsRepository
+from app.schemas.schemas import TaskCreate, TaskUpdate, UserCreate
+
+
+class AsyncTaskRepository:
+    """Async repository for Task CRUD operations"""
+    
+    @staticmethod
+    async def create(db: AsyncSession, task: TaskCreate, user_id: int) -> Task:
+        """Create a new task"""
+        return await db.run_sync(TaskRepository.create, task, user_id)
+    
+    @staticmethod
+    async def get_by_id(
+        db: AsyncSession,
+        task_id: int,
+        user_id: int,
+        load_description: bool = True
+    ) -> Optional[Task]:
+        """Get task by ID for specific user (see TaskRepository.get_by_id)"""
+        return await db.run_sync(TaskRepository.get_by_id, task_id, user_id, load_description=load_description)
+    
+    @staticmethod
+    async def get_many(db: AsyncSession, task_ids: List[int], user_id: int) -> Dict[int, Any]:
+        """Get the user's tasks among `task_ids` with one IN query, as rows keyed by id"""
+        return await db.run_sync(TaskRepository.get_many, task_ids, user_id)
+    
+    @staticmethod
+    async def get_row(db: AsyncSession, task_id: int, user_id: int):
+        """Get task by ID for specific user as a read-only row"""
+        return await db.run_sync(TaskRepository.get_row, task_id, user_id)
+    
+    @staticmethod
+    async def get_all(db: AsyncSession, user_id: int, **filters: Any) -> tuple[list, Optional[int]]:
+        """Get tasks for user; accepts the same keyword filters as TaskRepository.get_all"""
+        return await db.run_sync(TaskRepository.get_all, user_id, **filters)
+    
+    @staticmethod
+    async def update(
+        db: AsyncSession,
+        task_id: int,
+        user_id: int,
+        task_update: TaskUpdate,
+        expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Task]:
+        """Update task (only if unchanged since `expected_updated_at`, when given)"""
+        return await db.run_sync(TaskRepository.update, task_id, user_id, task_update, expected_updated_at)
+    
+    @staticmethod
+    async def delete(
+        db: AsyncSession,
+        task_id: int,
+        user_id: int,
+        expected_updated_at: Optional[datetime] = None
+    ) -> bool:
+        """Delete task (only if unchanged since `expected_updated_at`, when given)"""
+        return await db.run_sync(TaskRepository.delete, task_id, user_id, expected_updated_at)
+    
+    @staticmethod
+    async def bulk_write(
+        db: AsyncSession,
+        user_id: int,
+        creates: List[TaskCreate],
+        updates: Dict[int, dict],
+        deletes: List[int]
+    ) -> tuple[List[Task], Dict[int, Task], set]:
+        """Apply many creates, updates and deletes in one transaction"""
+        return await db.run_sync(TaskRepository.bulk_write, user_id, creates, updates, deletes)
+
+
+class AsyncUserRepository:
+    """Async repository for User CRUD operations"""
+    
+    @staticmethod
+    async def create(db: AsyncSession, user: UserCreate, hashed_password: str) -> User:
+        """Create a new user from an already hashed password"""
+        return await db.run_sync(UserRepository.create, user, hashed_password)
+    
+    @staticmethod
+    async def add(db: AsyncSession, user: UserCreate, hashed_password: str) -> User:
+        """Add a new user from an already hashed password without committing"""
+        return await db.run_sync(UserRepository.add, user, hashed_password)
+    
+    @staticmethod
+    async def get_by_username(db: AsyncSession, username: str) -> Optional[User]:
+        """Get user by username"""
+        return await db.run_sync(UserRepository.get_by_username, username)
+    
+    @staticmethod
+    async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        """Get user by email"""
+        return await db.run_sync(UserRepository.get_by_email, email)
+    
+    @staticmethod
+    async def get_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID"""
+        return await db.run_sync(UserRepository.get_by_id, user_id)
+    
+    @staticmethod
+    async def get_by_verification_token(db: AsyncSession, token: str) -> Optional[User]:
+        """Get user by pending email verification token"""
+        return await db.run_sync(UserRepository.get_by_verification_token, token)
+    
+    @staticmethod
+    async def get_all(db: AsyncSession) -> List[User]:
+        """Get all users"""
+        return await db.run_sync(UserRepository.get_all)
+    
+    @staticmethod
+    async def delete(db: AsyncSession, user_id: int) -> bool:
+        """Delete user and, by cascade, all of their data"""
+        return await db.run_sync(UserRepository.delete, user_id)
+
+
+class AsyncTaskStatsRepository:
+    """Async repository for the per-user task aggregates"""
+    
+    @staticmethod
+    async def get_kpi_counts(db: AsyncSession, user_id: int, now: datetime) -> tuple[UserTaskStats, int, int]:
+        """Get the user's aggregates with the time-relative counts"""
+        return await db.run_sync(TaskStatsRepository.get_kpi_counts, user_id, now)
+    
+    @staticmethod
+    async def get_version(db: AsyncSession, user_id: int) -> int:
+        """Get the user's task change version"""
+        return await db.run_sync(TaskStatsRepository.get_version, user_id)
@@ -1,18 +1,83 @@
 """
 Repository layer for database operations
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import Optional, List
-from datetime import datetime
-from app.models.models import Task, User, TaskStatus, TaskPriority
+from sqlalchemy.orm import Session, defer
+from sqlalchemy import or_, and_, tuple_, select, func, exists, insert, update, delete, literal, String, case, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from typing import Optional, List, Dict, Any
+from types import SimpleNamespace
+from collections import Counter
+from datetime import datetime, timedelta
+from app.models.models import (
+    Task, User, UserTaskStats, Notification, EmailOutbox, SchedulerLease, SchedulerJobRun, TaskStatus, TaskPriority, OutboxStatus
+)
 from app.schemas.schemas import TaskCreate, TaskUpdate, UserCreate
 from app.core.security import get_password_hash
+from app.repositories.search import TaskSearch
+from app.db.database import mark_user_write
+from app.core.reminders import next_reminder_at
+
+
+# Columns that can be used for sorting (and therefore as keyset cursor keys)
+SORTABLE_COLUMNS = {
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+    "due_date": Task.due_date,
+    "start_date": Task.start_date,
+    "priority": Task.priority,
+    "status": Task.status,
+    "title": Task.title,
+}
+
+# Columns read for task responses: reads select these as plain rows instead of
+# hydrating ORM objects (see TaskService.to_dict)
+TASK_COLUMNS = [
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.status,
+    Task.priority,
+    Task.start_date,
+    Task.due_date,
+    Task.created_at,
+    Task.updated_at,
+    Task.user_id,
+]
+
+# Task response fields by name, for sparse fieldsets (`fields=`)
+TASK_FIELDS = {column.key: column for column in TASK_COLUMNS}
+
+# Dashboard task slices: name -> (filters, ordering) for the current time
+DASHBOARD_SLICES = {
+    "recent": lambda now: ([], [Task.created_at.desc(), Task.id.desc()]),
+    "due_soon": lambda now: (
+        [Task.status != TaskStatus.COMPLETED, Task.due_date >= now],
+        [Task.due_date.asc(), Task.id.asc()]
+    ),
+    "overdue": lambda now: (
+        [Task.status != TaskStatus.COMPLETED, Task.due_date < now],
+        [Task.due_date.asc(), Task.id.asc()]
+    ),
+    "in_progress": lambda now: (
+        [Task.status == TaskStatus.IN_PROGRESS],
+        [Task.updated_at.desc(), Task.id.desc()]
+    ),
+    "recently_completed": lambda now: (
+        [Task.status == TaskStatus.COMPLETED],
+        [Task.updated_at.desc(), Task.id.desc()]
+    ),
+}
 
 
 class TaskRepository:
     """Repository for Task CRUD operations"""
     
+    @staticmethod
+    def sort_column(sort_by: str):
+        """Resolve a sort field name to its column, defaulting to created_at"""
+        return SORTABLE_COLUMNS.get(sort_by, Task.created_at)
+    
     @staticmethod
     def create(db: Session, task: TaskCreate, user_id: int) -> Task:
         """Create a new task"""
@@ -20,18 +85,82 @@ class TaskRepository:
             **task.model_dump(),
             user_id=user_id
         )
+        db_task.next_reminder_at = TaskRepository.reminder_at(db_task, datetime.utcnow())
         db.add(db_task)
+        db.flush()
+        TaskStatsRepository.apply(db, user_id, TaskStatsRepository.contribution(db_task))
         db.commit()
         db.refresh(db_task)
         return db_task
     
     @staticmethod
-    def get_by_id(db: Session, task_id: int, user_id: int) -> Optional[Task]:
-        """Get task by ID for specific user"""
-        return db.query(Task).filter(
+    def reminder_at(task, now: datetime) -> Optional[datetime]:
+        """next_reminder_at for a task's status and due date (None unless it is open)"""
+        if task.status not in NotificationRepository.OPEN_STATUSES:
+            return None
+        return next_reminder_at(task.due_date, now)
+    
+    @staticmethod
+    def get_by_id(
+        db: Session,
+        task_id: int,
+        user_id: int,
+        updated_at: Optional[datetime] = None,
+        load_description: bool = True
+    ) -> Optional[Task]:
+        """
+        Get task by ID for specific user (only if last updated at `updated_at`, when given)
+        
+        `load_description=False` defers the (up to 2000 character) description
+        for callers that don't use it.
+        """
+        query = db.query(Task).filter(
+            and_(Task.id == task_id, Task.user_id == user_id)
+        )
+        if updated_at is not None:
+            query = query.filter(Task.updated_at == updated_at)
+        if not load_description:
+            query = query.options(defer(Task.description))
+        return query.first()
+    
+    @staticmethod
+    def read_columns(fields: Optional[List[str]], *required: str) -> list:
+        """
+        Columns to select for a sparse fieldset (all TASK_COLUMNS when `fields` is None)
+        
+        `id` and any `required` fields (e.g. the sort key a cursor needs) are
+        always selected, whether or not they are returned.
+        """
+        if fields is None:
+            return TASK_COLUMNS
+        wanted = {"id", *fields, *required}
+        return [column for name, column in TASK_FIELDS.items() if name in wanted]
+    
+    @staticmethod
+    def get_row(db: Session, task_id: int, user_id: int):
+        """Get task by ID for specific user as a read-only row of TASK_COLUMNS"""
+        return db.query(*TASK_COLUMNS).filter(
             and_(Task.id == task_id, Task.user_id == user_id)
         ).first()
     
+    @staticmethod
+    def get_many(db: Session, task_ids: List[int], user_id: int) -> Dict[int, Any]:
+        """Get the user's tasks among `task_ids` with one IN query, as rows keyed by id"""
+        if not task_ids:
+            return {}
+        return {
+            row.id: row
+            for row in db.query(*TASK_COLUMNS).filter(Task.user_id == user_id, Task.id.in_(set(task_ids)))
+        }
+    
+    @staticmethod
+    def get_slice(db: Session, user_id: int, slice_name: str, limit: int, now: datetime) -> list:
+        """Get the first `limit` rows of a dashboard slice (see DASHBOARD_SLICES)"""
+        filters, ordering = DASHBOARD_SLICES[slice_name](now)
+        return db.query(*TASK_COLUMNS).filter(
+            Task.user_id == user_id, *filters
+        ).order_by(*ordering).limit(limit).all()
+    
     @staticmethod
     def get_all(
         db: Session,
@@ -42,17 +171,47 @@ class TaskRepository:
         status: Optional[TaskStatus] = None,
         priority: Optional[TaskPriority] = None,
         sort_by: str = "created_at",
-        sort_order: str = "desc"
-    ) -> tuple[List[Task], int]:
+        sort_order: str = "desc",
+        after: Optional[tuple[Any, int]] = None,
+        with_total: bool = True,
+        highlight: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> tuple[list, Optional[int]]:
         """
         Get all tasks for user with filters, search, and pagination
-        Returns tuple of (tasks, total_count)
+        
+        Tasks are read as plain rows of TASK_COLUMNS (no ORM objects), or only
+        of the requested `fields` plus id and the sort key.
+        
+        `search` runs against the full-text index where the database has one
+        (see TaskSearch); matched rows carry a `search_rank` column, plus a raw
+        `snippet` when `highlight` is set, and can be ordered with
+        sort_by="relevance". Other databases fall back to substring matching.
+        
+        When `after` is given as (sort_value, task_id), rows are read with a
+        keyset predicate instead of OFFSET, so the cost of a page does not
+        depend on how deep it is. `with_total=False` skips the COUNT query.
+        
+        Returns tuple of (rows, total_count); total_count is None when skipped
         """
-        query = db.query(Task).filter(Task.user_id == user_id)
+        columns = TaskRepository.read_columns(fields, sort_by)
+        matches = None
+        if TaskSearch.can_rank(db, search):
+            matches = TaskSearch.matches(db, search, user_id, highlight)
+            extra_columns = [matches.c.rank.label("search_rank")]
+            if highlight:
+                extra_columns.append(matches.c.snippet)
+            # Drive the join from the (already user-scoped) matches
+            query = db.query(*columns, *extra_columns).select_from(matches).join(
+                Task, Task.id == matches.c.task_id
+            )
+        else:
+            query = db.query(*columns)
+        filters = [Task.user_id == user_id]
         
         # Apply filters
-        if search:
-            query = query.filter(
+        if search and matches is None:
+            filters.append(
                 or_(
                     Task.title.ilike(f"%{search}%"),
                     Task.description.ilike(f"%{search}%")
@@ -60,71 +219,439 @@ class TaskRepository:
             )
         
         if status:
-            query = query.filter(Task.status == status)
+            filters.append(Task.status == status)
         
         if priority:
-            query = query.filter(Task.priority == priority)
+            filters.append(Task.priority == priority)
         
-        # Get total count before pagination
-        total = query.count()
+        query = query.filter(*filters)
         
-        # Apply sorting
-        sort_column = getattr(Task, sort_by, Task.created_at)
-        if sort_order == "desc":
-            query = query.order_by(sort_column.desc())
+        # Get total count before pagination. Searches count over the same
+        # match-driven join, without building snippets for every match.
+        if not with_total:
+            total = None
+        elif matches is not None:
+            count_matches = TaskSearch.matches(db, search, user_id) if highlight else matches
+            total = db.query(func.count()).select_from(count_matches).join(
+                Task, Task.id == count_matches.c.task_id
+            ).filter(*filters).scalar()
+        else:
+            total = query.count()
+        
+        # Apply sorting (id breaks ties so the order is total and stable;
+        # NULLs always sort last so they form a single trailing block)
+        if sort_by == "relevance" and matches is not None:
+            sort_column, nullable = matches.c.rank, False
+        else:
+            sort_column = TaskRepository.sort_column(sort_by)
+            nullable = sort_column.nullable
+        descending = sort_order == "desc"
+        if descending:
+            query = query.order_by(sort_column.desc().nulls_last(), Task.id.desc())
         else:
-            query = query.order_by(sort_column.asc())
+            query = query.order_by(sort_column.asc().nulls_last(), Task.id.asc())
         
         # Apply pagination
-        tasks = query.offset(skip).limit(limit).all()
+        if after is not None:
+            query = query.filter(
+                TaskRepository._keyset_predicate(sort_column, nullable, descending, *after)
+            )
+            rows = query.limit(limit).all()
+        else:
+            rows = query.offset(skip).limit(limit).all()
+        
+        return rows, total
+    
+    @staticmethod
+    def _keyset_predicate(sort_column, nullable: bool, descending: bool, value: Any, last_id: int):
+        """Build the WHERE clause selecting rows strictly after (value, last_id)"""
+        if value is None:
+            # Already inside the trailing NULL block: continue by id only
+            id_clause = Task.id < last_id if descending else Task.id > last_id
+            return and_(sort_column.is_(None), id_clause)
         
-        return tasks, total
+        row = tuple_(sort_column, Task.id)
+        clause = row < (value, last_id) if descending else row > (value, last_id)
+        if nullable:
+            clause = or_(clause, sort_column.is_(None))
+        return clause
+    
+    @staticmethod
+    def _claim(db: Session, task_id: int, user_id: int, expected_updated_at: datetime) -> bool:
+        """
+        Lock the task's row if it is still at `expected_updated_at` (If-Match compare-and-set)
+        
+        A no-op UPDATE conditional on updated_at takes the row's write lock
+        before the task is read, so a concurrent write carrying the same
+        ETag waits for this transaction and then matches no row.
+        """
+        result = db.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.user_id == user_id, Task.updated_at == expected_updated_at)
+            .values(updated_at=Task.updated_at),
+            execution_options={"synchronize_session": False}
+        )
+        return result.rowcount == 1
     
     @staticmethod
-    def update(db: Session, task_id: int, user_id: int, task_update: TaskUpdate) -> Optional[Task]:
-        """Update task"""
+    def update(
+        db: Session,
+        task_id: int,
+        user_id: int,
+        task_update: TaskUpdate,
+        expected_updated_at: Optional[datetime] = None
+    ) -> Optional[Task]:
+        """Update task (only if unchanged since `expected_updated_at`, when given)"""
+        if expected_updated_at is not None and not TaskRepository._claim(db, task_id, user_id, expected_updated_at):
+            db.rollback()
+            return None
         db_task = TaskRepository.get_by_id(db, task_id, user_id)
         if not db_task:
             return None
         
+        before = TaskStatsRepository.contribution(db_task)
+        due_date = db_task.due_date
         update_data = task_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_task, field, value)
         
         db_task.updated_at = datetime.utcnow()
+        if "status" in update_data or "due_date" in update_data:
+            db_task.next_reminder_at = TaskRepository.reminder_at(db_task, db_task.updated_at)
+        if db_task.due_date != due_date:
+            # A new due date gets its reminders again
+            db.execute(delete(Notification).where(Notification.task_id == db_task.id))
+        db.flush()
+        delta = TaskStatsRepository.contribution(db_task)
+        delta.subtract(before)
+        TaskStatsRepository.apply(db, user_id, delta)
         db.commit()
         db.refresh(db_task)
         return db_task
     
     @staticmethod
-    def delete(db: Session, task_id: int, user_id: int) -> bool:
-        """Delete task"""
-        db_task = TaskRepository.get_by_id(db, task_id, user_id)
+    def delete(
+        db: Session,
+        task_id: int,
+        user_id: int,
+        expected_updated_at: Optional[datetime] = None
+    ) -> bool:
+        """Delete task (only if unchanged since `expected_updated_at`, when given)"""
+        if expected_updated_at is not None and not TaskRepository._claim(db, task_id, user_id, expected_updated_at):
+            db.rollback()
+            return False
+        db_task = TaskRepository.get_by_id(db, task_id, user_id, load_description=False)
         if not db_task:
             return False
         
+        delta = Counter()
+        delta.subtract(TaskStatsRepository.contribution(db_task))
         db.delete(db_task)
+        db.flush()
+        TaskStatsRepository.apply(db, user_id, delta)
         db.commit()
         return True
+    
+    @staticmethod
+    def bulk_write(
+        db: Session,
+        user_id: int,
+        creates: List[TaskCreate],
+        updates: Dict[int, dict],
+        deletes: List[int]
+    ) -> tuple[List[Task], Dict[int, Task], set]:
+        """
+        Apply many creates, updates and deletes in one transaction
+        
+        `updates` maps task id -> changed fields. Existing tasks are loaded
+        with one IN query; updates sharing the same changes run as one
+        UPDATE ... WHERE id IN, deletes as one DELETE, creates as one
+        multi-row INSERT. Ids the user doesn't own are skipped.
+        
+        Returns:
+            Tuple of (created tasks in order, updated tasks by id, deleted ids)
+        """
+        now = datetime.utcnow()
+        delta = Counter()
+        
+        existing = {}
+        ids = list(updates) + list(deletes)
+        if ids:
+            # Descriptions are deferred: only reloaded for tasks that were updated
+            existing = {
+                task.id: task
+                for task in db.query(Task).options(defer(Task.description)).filter(
+                    Task.user_id == user_id, Task.id.in_(ids)
+                )
+            }
+        
+        # Updates: group ids by identical changes so each group is one statement
+        groups: Dict[tuple, List[int]] = {}
+        rescheduled = []
+        for task_id, changes in updates.items():
+            task = existing.get(task_id)
+            if task is None:
+                continue
+            after = SimpleNamespace(
+                **{field: getattr(task, field) for field in ("status", "priority", "start_date", "due_date")}
+            )
+            for field, value in changes.items():
+                setattr(after, field, value)
+            after.updated_at = now
+            delta.update(TaskStatsRepository.contribution(after))
+            delta.subtract(TaskStatsRepository.contribution(task))
+            if "status" in changes or "due_date" in changes:
+                changes = {**changes, "next_reminder_at": TaskRepository.reminder_at(after, now)}
+            if after.due_date != task.due_date:
+                rescheduled.append(task_id)
+            groups.setdefault(tuple(sorted(changes.items())), []).append(task_id)
+        
+        for changes, group_ids in groups.items():
+            db.query(Task).filter(Task.user_id == user_id, Task.id.in_(group_ids)).update(
+                {**dict(changes), "updated_at": now}, synchronize_session=False
+            )
+        if rescheduled:
+            # A new due date gets its reminders again
+            db.execute(delete(Notification).where(Notification.task_id.in_(rescheduled)))
+        
+        # Deletes: notifications first (no ON DELETE CASCADE), then the tasks
+        deleted = {task_id for task_id in deletes if task_id in existing}
+        if deleted:
+            for task_id in deleted:
+                delta.subtract(TaskStatsRepository.contribution(existing[task_id]))
+            db.execute(delete(Notification).where(Notification.task_id.in_(deleted)))
+            db.execute(
+                delete(Task).where(Task.user_id == user_id, Task.id.in_(deleted)),
+                execution_options={"synchronize_session": False}
+            )
+            # SQLite can reuse a freed rowid for a create below; a stale object
+            # left in the identity map would then be returned by the RETURNING
+            for task_id in deleted:
+                db.expunge(existing[task_id])
+        
+        # Creates: one multi-row INSERT, with RETURNING rows guaranteed to
+        # come back in parameter (request) order across insertmanyvalues batches
+        created = []
+        if creates:
+            created = db.scalars(
+                insert(Task).returning(Task, sort_by_parameter_order=True),
+                [
+                    {
+                        **task.model_dump(),
+                        "user_id": user_id,
+                        "next_reminder_at": TaskRepository.reminder_at(task, now),
+                    }
+                    for task in creates
+                ]
+            ).all()
+            for task in created:
+                delta.update(TaskStatsRepository.contribution(task))
+        
+        TaskStatsRepository.apply(db, user_id, delta)
+        reload_ids = [task_id for group_ids in groups.values() for task_id in group_ids]
+        reload_ids += [task.id for task in created]
+        db.commit()
+        
+        # Reload changed rows (one query) so responses reflect the committed state
+        updated = {}
+        if reload_ids:
+            db.query(Task).filter(Task.id.in_(reload_ids)).populate_existing().all()
+            updated = {
+                task_id: existing[task_id]
+                for group_ids in groups.values()
+                for task_id in group_ids
+            }
+        
+        return created, updated, deleted
+
+
+class TaskStatsRepository:
+    """
+    Repository for the per-user task aggregates (UserTaskStats)
+    
+    Every task write adds the difference between the task's contribution
+    after and before the change, inside the caller's transaction. Counters
+    are bumped with `col = col + delta` so concurrent writers don't lose
+    updates. A missing row is rebuilt by the next task write; reads compute
+    the aggregates without storing them.
+    """
+    
+    STATUS_COUNTERS = {
+        TaskStatus.NOT_STARTED: "not_started_tasks",
+        TaskStatus.IN_PROGRESS: "in_progress_tasks",
+        TaskStatus.COMPLETED: "completed_tasks",
+    }
+    
+    PRIORITY_COUNTERS = {
+        TaskPriority.HIGH: "high_priority_tasks",
+        TaskPriority.MEDIUM: "medium_priority_tasks",
+        TaskPriority.LOW: "low_priority_tasks",
+    }
+    
+    @staticmethod
+    def contribution(task) -> Counter:
+        """Counters a single task adds to its owner's aggregates"""
+        counts = Counter({
+            "total_tasks": 1,
+            TaskStatsRepository.STATUS_COUNTERS[task.status]: 1,
+            TaskStatsRepository.PRIORITY_COUNTERS[task.priority]: 1,
+        })
+        if task.status == TaskStatus.COMPLETED:
+            if task.start_date and task.updated_at:
+                counts["completion_days_total"] += (task.updated_at - task.start_date).days
+                counts["completion_days_count"] += 1
+            if task.due_date:
+                counts["completed_with_due_date"] += 1
+                if task.updated_at <= task.due_date:
+                    counts["completed_on_time"] += 1
+        return counts
+    
+    @staticmethod
+    def apply(db: Session, user_id: int, delta: Counter) -> None:
+        """
+        Add `delta` to the user's aggregates and bump their change version
+        
+        Call after flushing the task change. The version is bumped even when
+        no counter changes (e.g. a title edit).
+        """
+        changes = {
+            getattr(UserTaskStats, name): getattr(UserTaskStats, name) + value
+            for name, value in delta.items()
+            if value
+        }
+        changes[UserTaskStats.version] = UserTaskStats.version + 1
+        mark_user_write(db, user_id)
+        changes[UserTaskStats.updated_at] = datetime.utcnow()
+        updated = db.query(UserTaskStats).filter(
+            UserTaskStats.user_id == user_id
+        ).update(changes, synchronize_session=False)
+        if not updated:
+            # No aggregates yet: compute them from the (already flushed) tasks
+            TaskStatsRepository.rebuild_user(db, user_id)
+    
+    @staticmethod
+    def compute_counts(db: Session, user_id: int) -> Counter:
+        """Sum the contributions of all of one user's tasks (read-only)"""
+        counts = Counter()
+        rows = db.query(
+            Task.status, Task.priority, Task.start_date, Task.due_date, Task.updated_at
+        ).filter(Task.user_id == user_id).yield_per(1000)
+        for row in rows:
+            counts.update(TaskStatsRepository.contribution(row))
+        return counts
+    
+    @staticmethod
+    def rebuild_user(db: Session, user_id: int) -> UserTaskStats:
+        """Recompute one user's aggregates from their tasks (does not commit)"""
+        counts = TaskStatsRepository.compute_counts(db, user_id)
+        
+        stats = db.get(UserTaskStats, user_id)
+        if stats is None:
+            stats = UserTaskStats(user_id=user_id)
+            db.add(stats)
+        for column in UserTaskStats.__table__.columns:
+            if column.name not in ("user_id", "version", "updated_at"):
+                setattr(stats, column.name, counts[column.name])
+        stats.version = (stats.version or 0) + 1
+        stats.updated_at = datetime.utcnow()
+        db.flush()
+        return stats
+    
+    @staticmethod
+    def rebuild_all(db: Session) -> int:
+        """Recompute aggregates for every user; returns the number of users"""
+        user_ids = [user_id for (user_id,) in db.query(User.id).order_by(User.id)]
+        for user_id in user_ids:
+            TaskStatsRepository.rebuild_user(db, user_id)
+            db.commit()
+        return len(user_ids)
+    
+    @staticmethod
+    def get_version(db: Session, user_id: int) -> int:
+        """Get the user's task change version (0 if they have no aggregates yet)"""
+        version = db.query(UserTaskStats.version).filter(UserTaskStats.user_id == user_id).scalar()
+        return version or 0
+    
+    @staticmethod
+    def get_kpi_counts(db: Session, user_id: int, now: datetime) -> tuple[UserTaskStats, int, int]:
+        """
+        Get the user's aggregates with the time-relative counts
+        
+        Returns (stats, overdue_tasks, this_week_completed). The two counts
+        depend on the current time, so they are read in the same round trip
+        as index range scans over (user_id, status, due_date/updated_at).
+        
+        This runs on read (possibly replica) sessions, so a user without an
+        aggregates row gets them computed from their tasks without being
+        stored; the next task write creates the row.
+        """
+        open_statuses = [TaskStatus.NOT_STARTED, TaskStatus.IN_PROGRESS]
+        overdue = (
+            select(func.count(Task.id))
+            .where(Task.user_id == user_id, Task.status.in_(open_statuses), Task.due_date < now)
+            .scalar_subquery()
+        )
+        this_week_completed = (
+            select(func.count(Task.id))
+            .where(
+                Task.user_id == user_id,
+                Task.status == TaskStatus.COMPLETED,
+                Task.updated_at >= now - timedelta(days=7)
+            )
+            .scalar_subquery()
+        )
+        row = db.query(UserTaskStats, overdue, this_week_completed).filter(
+            UserTaskStats.user_id == user_id
+        ).first()
+        if row is None:
+            counts = TaskStatsRepository.compute_counts(db, user_id)
+            stats = UserTaskStats(user_id=user_id, version=0, **{
+                column.name: counts[column.name]
+                for column in UserTaskStats.__table__.columns
+                if column.name not in ("user_id", "version", "updated_at")
+            })
+            return (stats, *db.query(overdue, this_week_completed).one())
+        return row[0], row[1], row[2]
 
 
 class UserRepository:
     """Repository for User CRUD operations"""
     
     @staticmethod
-    def create(db: Session, user: UserCreate) -> User:
-        """Create a new user"""
-        hashed_password = get_password_hash(user.password)
+    def create(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+        """Create a new user (hashes `user.password` unless a hash is given)"""
+        db_user = UserRepository.add(db, user, hashed_password)
+        db.commit()
+        db.refresh(db_user)
+        return db_user
+    
+    @staticmethod
+    def add(
+        db: Session,
+        user: UserCreate,
+        hashed_password: Optional[str] = None,
+        verification_token: Optional[str] = None
+    ) -> User:
+        """Add a new user to the session without committing (for multi-row transactions)"""
+        if hashed_password is None:
+            hashed_password = get_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
-            hashed_password=hashed_password
+            hashed_password=hashed_password,
+            verification_token=verification_token,
+            timezone=user.timezone,
+            task_stats=UserTaskStats()
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        db.flush()
         return db_user
     
+    @staticmethod
+    def get_timezones(db: Session) -> List[str]:
+        """Distinct timezones users have set (a scan of the timezone index)"""
+        return [row[0] for row in db.query(User.timezone).distinct()]
+    
     @staticmethod
     def get_by_username(db: Session, username: str) -> Optional[User]:
         """Get user by username"""
@@ -139,3 +666,281 @@ class UserRepository:
     def get_by_id(db: Session, user_id: int) -> Optional[User]:
         """Get user by ID"""
         return db.query(User).filter(User.id == user_id).first()
+    
+    @staticmethod
+    def get_by_verification_token(db: Session, token: str) -> Optional[User]:
+        """Get user by pending email verification token"""
+        return db.query(User).filter(User.verification_token == token).first()
+    
+    @staticmethod
+    def get_all(db: Session) -> List[User]:
+        """Get all users"""
+        return db.query(User).all()
+    
+    @staticmethod
+    def delete(db: Session, user_id: int) -> bool:
+        """Delete user and, by cascade, all of their data"""
+        db_user = UserRepository.get_by_id(db, user_id)
+        if not db_user:
+            return False
+        
+        db.delete(db_user)
+        db.commit()
+        return True
+
+
+class NotificationRepository:
+    """Repository for due-date reminder bookkeeping"""
+    
+    OPEN_STATUSES = [TaskStatus.NOT_STARTED, TaskStatus.IN_PROGRESS]
+    
+    @staticmethod
+    def get_pending_reminders(
+        db: Session,
+        due_from: datetime,
+        due_until: datetime,
+        notification_type,
+        timezones: Optional[List[str]] = None
+    ) -> list:
+        """
+        Get open tasks due in [due_from, due_until) that haven't had this notification
+        
+        `notification_type` is a string or a SQL expression over Task (e.g. a
+        CASE on due_date) naming the reminder each task would receive.
+        `timezones` limits it to owners in those timezones. One query: range
+        scan on (status, due_date), anti-join on notifications, join to the
+        owner. Rows have task_id, user_id, title, due_date, email, username,
+        timezone and notification_type.
+        """
+        if isinstance(notification_type, str):
+            notification_type = literal(notification_type, String)
+        already_sent = exists().where(
+            Notification.task_id == Task.id,
+            Notification.notification_type == notification_type
+        )
+        query = db.query(
+            Task.id.label("task_id"),
+            Task.user_id,
+            Task.title,
+            Task.due_date,
+            User.email,
+            User.username,
+            User.timezone,
+            notification_type.label("notification_type")
+        ).join(User, User.id == Task.user_id).filter(
+            Task.status.in_(NotificationRepository.OPEN_STATUSES),
+            Task.due_date >= due_from,
+            Task.due_date < due_until,
+            ~already_sent
+        )
+        if timezones is not None:
+            query = query.filter(User.timezone.in_(timezones))
+        return query.order_by(Task.user_id, Task.due_date).all()
+    
+    @staticmethod
+    def record_sent(db: Session, sent: List[dict]) -> None:
+        """
+        Bulk-insert notification records (task_id, user_id, notification_type)
+        
+        Rows that already exist are skipped via the unique
+        (task_id, notification_type) index, so concurrent runs can't double-record.
+        """
+        if not sent:
+            return
+        now = datetime.utcnow()
+        rows = [{**row, "sent_at": now} for row in sent]
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(Notification).on_conflict_do_nothing(
+                index_elements=["task_id", "notification_type"]
+            )
+        elif dialect == "sqlite":
+            statement = sqlite.insert(Notification).on_conflict_do_nothing(
+                index_elements=["task_id", "notification_type"]
+            )
+        else:
+            statement = insert(Notification)
+        db.execute(statement, rows)
+        db.commit()
+    
+    @staticmethod
+    def get_due_reminders(db: Session, now: datetime, limit: int) -> list:
+        """
+        Get open tasks whose next_reminder_at has come, soonest first
+        
+        An index range scan on next_reminder_at, so the work is proportional
+        to the reminders actually due. Rows have task_id, user_id, title,
+        due_date, next_reminder_at, email, username and timezone.
+        """
+        return db.query(
+            Task.id.label("task_id"),
+            Task.user_id,
+            Task.title,
+            Task.due_date,
+            Task.next_reminder_at,
+            User.email,
+            User.username,
+            User.timezone
+        ).join(User, User.id == Task.user_id).filter(
+            Task.next_reminder_at <= now,
+            Task.status.in_(NotificationRepository.OPEN_STATUSES)
+        ).order_by(Task.next_reminder_at).limit(limit).all()
+    
+    @staticmethod
+    def get_sent(db: Session, task_ids: List[int]) -> set:
+        """(task_id, notification_type) pairs already recorded for these tasks"""
+        if not task_ids:
+            return set()
+        return set(
+            db.query(Notification.task_id, Notification.notification_type).filter(
+                Notification.task_id.in_(task_ids)
+            ).all()
+        )
+    
+    @staticmethod
+    def reschedule(db: Session, schedule: Dict[int, tuple]) -> set:
+        """
+        Move next_reminder_at on, per task id, from the value the dispatcher read (not committed)
+        
+        `schedule` maps task id to (read next_reminder_at, new next_reminder_at).
+        Each UPDATE only applies if next_reminder_at still holds the read
+        value, so a task write that rescheduled the task meanwhile (e.g. a
+        new due date) isn't clobbered. Returns the ids that were updated.
+        
+        updated_at is left alone: scheduling isn't a change to the task, so
+        it must not invalidate ETags.
+        """
+        if not schedule:
+            return set()
+        tasks = Task.__table__
+        statement = update(tasks).where(
+            tasks.c.id == bindparam("task_id"),
+            tasks.c.next_reminder_at == bindparam("read_at")
+        ).values(
+            next_reminder_at=bindparam("next_at"),
+            updated_at=tasks.c.updated_at
+        )
+        # One statement per row: executemany doesn't report per-row rowcounts
+        return {
+            task_id
+            for task_id, (read_at, next_at) in schedule.items()
+            if db.execute(statement, {"task_id": task_id, "read_at": read_at, "next_at": next_at}).rowcount
+        }
+
+
+class OutboxRepository:
+    """Repository for the transactional email outbox"""
+    
+    @staticmethod
+    def enqueue(db: Session, kind: str, to_email: str, payload: dict) -> EmailOutbox:
+        """
+        Add an outgoing email to the session without committing
+        
+        The caller commits it together with the change that triggered it.
+        Only touches the session, so it works with sync and async sessions.
+        """
+        message = EmailOutbox(
+            kind=kind,
+            to_email=to_email,
+            payload=payload,
+            status=OutboxStatus.PENDING,
+            attempts=0,
+            next_attempt_at=datetime.utcnow()
+        )
+        db.add(message)
+        return message
+    
+    @staticmethod
+    def claim_due(db: Session, limit: int, lease: timedelta) -> List[EmailOutbox]:
+        """
+        Claim up to `limit` pending messages whose next attempt is due
+        
+        Claiming counts an attempt and pushes next_attempt_at out by `lease`,
+        so a worker that dies mid-delivery only delays the retry. On
+        PostgreSQL, rows locked by another worker are skipped.
+        """
+        now = datetime.utcnow()
+        messages = db.query(EmailOutbox).filter(
+            EmailOutbox.status == OutboxStatus.PENDING,
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at, EmailOutbox.id).limit(limit).with_for_update(
+            skip_locked=True
+        ).all()
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + lease
+        db.commit()
+        return messages
+
+
+class LeaseRepository:
+    """Repository for named leader leases and the scheduled jobs' last runs"""
+    
+    @staticmethod
+    def acquire(db: Session, name: str, holder: str, ttl: timedelta) -> bool:
+        """
+        Take or renew the lease `name` for `holder` until now + `ttl`
+        
+        Succeeds if the lease is free, expired or already held by `holder`.
+        The conditional UPDATE (or the INSERT of a new lease row) is atomic,
+        so at most one holder wins. Commits.
+        """
+        now = datetime.utcnow()
+        renewed = db.query(SchedulerLease).filter(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now)
+        ).update(
+            {
+                SchedulerLease.acquired_at: case(
+                    (SchedulerLease.holder == holder, SchedulerLease.acquired_at), else_=now
+                ),
+                SchedulerLease.holder: holder,
+                SchedulerLease.expires_at: now + ttl,
+            },
+            synchronize_session=False
+        )
+        if renewed:
+            db.commit()
+            return True
+        
+        if db.query(exists().where(SchedulerLease.name == name)).scalar():
+            db.rollback()
+            return False
+        try:
+            db.add(SchedulerLease(name=name, holder=holder, expires_at=now + ttl, acquired_at=now))
+            db.commit()
+            return True
+        except IntegrityError:
+            # Another process created the lease first
+            db.rollback()
+            return False
+    
+    @staticmethod
+    def release(db: Session, name: str, holder: str) -> None:
+        """Give up the lease if `holder` has it, so another process can take over at once"""
+        db.query(SchedulerLease).filter(
+            SchedulerLease.name == name, SchedulerLease.holder == holder
+        ).delete(synchronize_session=False)
+        db.commit()
+    
+    @staticmethod
+    def get_last_run(db: Session, job: str) -> Optional[datetime]:
+        """When the job `job` last recorded a run (None if it never has)"""
+        return db.query(SchedulerJobRun.last_run_at).filter(SchedulerJobRun.name == job).scalar()
+    
+    @staticmethod
+    def record_run(db: Session, job: str, at: datetime) -> None:
+        """Move the job's last run time forward to `at` (never back). Commits."""
+        updated = db.query(SchedulerJobRun).filter(SchedulerJobRun.name == job).update(
+            {SchedulerJobRun.last_run_at: case(
+                (SchedulerJobRun.last_run_at < at, at), else_=SchedulerJobRun.last_run_at
+            )},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(SchedulerJobRun(name=job, last_run_at=at))
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another process recorded the first run at the same time
+            db.rollback()
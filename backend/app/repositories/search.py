@@ -0,0 +1,120 @@
+"""
+Full-text search over task titles and descriptions
+
+SQLite uses the FTS5 table `tasks_fts` and PostgreSQL uses the generated
+`tasks.search_vector` tsvector column with a GIN index. Both are created and
+kept in sync with `tasks` by the 0003 migration (triggers on SQLite, a stored
+generated column on PostgreSQL), so inserts, updates and deletes made through
+any code path are reflected without extra work in the repository.
+"""
+import html
+import re
+from typing import Optional
+from sqlalchemy import Float, cast, func, literal_column, select, text
+from sqlalchemy.orm import Session
+from app.models.models import Task
+
+# Sentinels used to mark highlighted terms before HTML-escaping the snippet
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_END = "\x03"
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class TaskSearch:
+    """Builds dialect-specific full-text match, rank and snippet expressions"""
+    
+    SUPPORTED_DIALECTS = ("sqlite", "postgresql")
+    
+    @staticmethod
+    def is_supported(db: Session) -> bool:
+        """Whether the session's database has a full-text index for tasks"""
+        return db.get_bind().dialect.name in TaskSearch.SUPPORTED_DIALECTS
+    
+    @staticmethod
+    def tokenize(search: str) -> list[str]:
+        """Split a user query into plain word tokens (drops query syntax)"""
+        return _TOKEN_PATTERN.findall(search)
+    
+    @staticmethod
+    def can_rank(db: Session, search: Optional[str]) -> bool:
+        """Whether `search` will run against the full-text index (and so has a relevance rank)"""
+        return bool(search) and TaskSearch.is_supported(db) and bool(TaskSearch.tokenize(search))
+    
+    @staticmethod
+    def matches(db: Session, search: str, user_id: int, highlight: bool = False):
+        """
+        Build a subquery of the user's tasks matching `search`
+        
+        Columns: task_id, rank (higher is more relevant) and, when
+        `highlight` is set, snippet. Returns None if the query has no
+        searchable tokens.
+        
+        On SQLite the match drives the query: FTS5 is searched once, joined
+        to the owner's tasks by rowid, and materialized as a CTE so the
+        planner can't re-run the MATCH for every task the user has. The cost
+        grows with the number of matches, not the size of the user's list.
+        """
+        tokens = TaskSearch.tokenize(search)
+        if not tokens:
+            return None
+        
+        if db.get_bind().dialect.name == "sqlite":
+            # Every token must match, each as a prefix ("plan" finds "planning")
+            fts_query = " ".join(f'"{token}"*' for token in tokens)
+            fts = literal_column("tasks_fts")
+            columns = [
+                literal_column("tasks_fts.rowid").label("task_id"),
+                # bm25() is lower-is-better; negate it so higher ranks first.
+                # Title matches weigh more than description matches.
+                (-func.bm25(fts, 10.0, 1.0)).label("rank"),
+            ]
+            if highlight:
+                columns.append(
+                    func.snippet(
+                        fts, -1, _HIGHLIGHT_START, _HIGHLIGHT_END, "…", 16
+                    ).label("snippet")
+                )
+            # CROSS JOIN keeps tasks_fts as the outer loop (SQLite never reorders it)
+            return (
+                select(*columns)
+                .select_from(text("tasks_fts CROSS JOIN tasks ON tasks.id = tasks_fts.rowid"))
+                .where(fts.op("MATCH")(fts_query), literal_column("tasks.user_id") == user_id)
+                .cte("search_matches")
+                .prefix_with("MATERIALIZED")
+            )
+        
+        ts_query = func.to_tsquery("english", " & ".join(f"{token}:*" for token in tokens))
+        vector = literal_column("tasks.search_vector")
+        columns = [
+            Task.id.label("task_id"),
+            # ts_rank_cd() is float4; widen it so ranks round-trip exactly
+            # through the JSON page cursor and the keyset comparison
+            cast(func.ts_rank_cd(vector, ts_query), Float(precision=53)).label("rank"),
+        ]
+        if highlight:
+            columns.append(
+                func.ts_headline(
+                    "english",
+                    func.coalesce(Task.description, Task.title),
+                    ts_query,
+                    f"StartSel={_HIGHLIGHT_START},StopSel={_HIGHLIGHT_END},"
+                    "MaxWords=24,MinWords=8,ShortWord=2",
+                ).label("snippet")
+            )
+        return (
+            select(*columns)
+            .where(vector.op("@@")(ts_query), Task.user_id == user_id)
+            .subquery("search_matches")
+        )
+    
+    @staticmethod
+    def render_snippet(snippet: Optional[str]) -> Optional[str]:
+        """HTML-escape a raw snippet and wrap matched terms in <mark> tags"""
+        if snippet is None:
+            return None
+        return (
+            html.escape(snippet)
+            .replace(_HIGHLIGHT_START, "<mark>")
+            .replace(_HIGHLIGHT_END, "</mark>")
+        )
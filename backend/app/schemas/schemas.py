@@ -1,10 +1,11 @@
 """
 Pydantic schemas for request/response validation
 """
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from pydantic import BaseModel, Field, EmailStr, AfterValidator
+from typing import Optional, Literal, Union, Annotated
 from datetime import datetime
 from enum import Enum
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 
 class TaskStatus(str, Enum):
@@ -59,16 +60,88 @@ class TaskResponse(TaskBase):
         from_attributes = True
 
 
+class TaskListItem(TaskResponse):
+    """A task in a list response; `snippet` is only present for highlighted searches"""
+    snippet: Optional[str] = None  # Highlighted search excerpt (search with highlight=true)
+
+
 class TaskListResponse(BaseModel):
     """Schema for paginated task list response"""
-    tasks: list[TaskResponse]
-    total: int
-    page: int
+    tasks: list[TaskListItem]
+    total: Optional[int] = None  # None when include_total=false
+    page: Optional[int] = None  # None when paging by cursor
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page
+
+
+class TaskBatchItem(BaseModel):
+    """One requested task id and the task, if the user has it"""
+    id: int
+    found: bool
+    task: Optional[TaskResponse] = None
+
+
+class TaskBatchResponse(BaseModel):
+    """Schema for a batch task read, in request order"""
+    results: list[TaskBatchItem]
+
+
+class BulkCreate(BaseModel):
+    """Bulk operation: create a task"""
+    op: Literal["create"]
+    task: TaskCreate
+
+
+class BulkUpdate(BaseModel):
+    """Bulk operation: update a task (only provided fields are changed)"""
+    op: Literal["update"]
+    id: int
+    changes: TaskUpdate
+
+
+class BulkDelete(BaseModel):
+    """Bulk operation: delete a task"""
+    op: Literal["delete"]
+    id: int
+
+
+BulkOperation = Annotated[Union[BulkCreate, BulkUpdate, BulkDelete], Field(discriminator="op")]
+
+
+class BulkRequest(BaseModel):
+    """Schema for a bulk task mutation request"""
+    operations: list[BulkOperation] = Field(..., min_length=1, max_length=500)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one bulk operation, in request order"""
+    index: int
+    op: str
+    id: Optional[int] = None
+    status: int  # HTTP-style status for this item (201, 200, 404, 409)
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Schema for a bulk task mutation response"""
+    results: list[BulkItemResult]
 
 
 # User Schemas
+def _check_timezone(value: str) -> str:
+    """Accept only IANA timezone names (e.g. Europe/Berlin)"""
+    try:
+        ZoneInfo(value)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone: {value}")
+    return value
+
+
+TimezoneName = Annotated[str, AfterValidator(_check_timezone)]
+
+
 class UserBase(BaseModel):
     """Base user schema"""
     email: EmailStr
@@ -78,12 +151,14 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     """Schema for user registration"""
     password: str = Field(..., min_length=6)
+    timezone: TimezoneName = "UTC"
 
 
 class UserResponse(UserBase):
     """Schema for user response"""
     id: int
     is_verified: int
+    timezone: str
     created_at: datetime
     
     class Config:
@@ -116,3 +191,8 @@ class PasswordChange(BaseModel):
 class EmailUpdate(BaseModel):
     """Schema for updating email"""
     email: EmailStr
+
+
+class TimezoneUpdate(BaseModel):
+    """Schema for updating the user's timezone"""
+    timezone: TimezoneName
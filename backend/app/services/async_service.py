@@ -0,0 +1,237 @@
+"""
+Async service layer for business logic
+
+Mirrors the sync services on top of the async repositories. Blocking work
+that is not database I/O (bcrypt) is awaited off the event loop; response shaping is shared with the sync services.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, AsyncIterator
+from fastapi import HTTPException, status
+from app.repositories.async_repository import AsyncTaskRepository, AsyncUserRepository, AsyncTaskStatsRepository
+from app.repositories.search import TaskSearch
+from app.schemas.schemas import TaskCreate, TaskUpdate, TaskResponse, UserCreate, UserLogin
+from app.models.models import TaskStatus, TaskPriority, User
+from app.core.security import verify_password_async, get_password_hash_async, password_needs_rehash
+from app.services.service import TaskService, AnalyticsService, AuthService, DashboardService, _decode_cursor, _stale_task
+from datetime import datetime
+
+
+class AsyncTaskService:
+    """Async service for task business logic"""
+    
+    @staticmethod
+    async def create_task(db: AsyncSession, task: TaskCreate, user_id: int) -> TaskResponse:
+        """Create a new task"""
+        db_task = await AsyncTaskRepository.create(db, task, user_id)
+        return TaskResponse.model_validate(db_task)
+    
+    @staticmethod
+    async def get_task(db: AsyncSession, task_id: int, user_id: int) -> dict:
+        """Get task by ID (read path: a serialized row, see TaskService.to_dict)"""
+        row = await AsyncTaskRepository.get_row(db, task_id, user_id)
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return TaskService.to_dict(row)
+    
+    @staticmethod
+    async def get_tasks_by_ids(db: AsyncSession, task_ids: List[int], user_id: int) -> dict:
+        """Get many tasks by ID in request order, marking ids that weren't found"""
+        TaskService.check_batch_size(task_ids)
+        return TaskService.batch_results(task_ids, await AsyncTaskRepository.get_many(db, task_ids, user_id))
+    
+    @staticmethod
+    async def get_data_version(db: AsyncSession, user_id: int) -> int:
+        """The user's task change version (see TaskService.get_data_version)"""
+        return await AsyncTaskStatsRepository.get_version(db, user_id)
+    
+    @staticmethod
+    async def get_tasks(
+        db: AsyncSession,
+        user_id: int,
+        page: int = 1,
+        page_size: int = 10,
+        search: Optional[str] = None,
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        highlight: bool = False,
+        fields: Optional[List[str]] = None
+    ) -> dict:
+        """Get all tasks with pagination and filters (see TaskService.get_tasks)"""
+        sort_by = TaskService.resolve_sort(TaskSearch.can_rank(db, search), sort_by)
+        after = _decode_cursor(cursor, sort_by, sort_order) if cursor else None
+        
+        # Fetch one extra row to know whether a next page exists
+        tasks, total = await AsyncTaskRepository.get_all(
+            db,
+            user_id,
+            skip=(page - 1) * page_size,
+            limit=page_size + 1,
+            search=search,
+            status=status_filter,
+            priority=priority_filter,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            after=after,
+            with_total=include_total,
+            highlight=highlight,
+            fields=fields
+        )
+        
+        return TaskService.build_page(tasks, total, page, page_size, sort_by, sort_order, cursor, fields)
+    
+    @staticmethod
+    async def export_tasks(
+        db: AsyncSession,
+        user_id: int,
+        export_format: str,
+        search: Optional[str] = None,
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream all of the user's matching tasks (see TaskService.export_tasks)"""
+        yield TaskService.export_header(export_format)
+        after = None
+        while True:
+            rows, _ = await AsyncTaskRepository.get_all(
+                db,
+                user_id,
+                limit=TaskService.EXPORT_PAGE_SIZE,
+                search=search,
+                status=status_filter,
+                priority=priority_filter,
+                after=after,
+                with_total=False
+            )
+            if rows:
+                yield TaskService.render_export(rows, export_format)
+            if len(rows) < TaskService.EXPORT_PAGE_SIZE:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+    
+    @staticmethod
+    async def update_task(
+        db: AsyncSession,
+        task_id: int,
+        user_id: int,
+        task_update: TaskUpdate,
+        if_match: Optional[str] = None
+    ) -> TaskResponse:
+        """Update task (412 if `if_match` is given and the task has changed since)"""
+        expected_updated_at = TaskService.parse_if_match(task_id, if_match)
+        db_task = await AsyncTaskRepository.update(db, task_id, user_id, task_update, expected_updated_at)
+        if not db_task:
+            if expected_updated_at and await AsyncTaskRepository.get_by_id(db, task_id, user_id, load_description=False):
+                raise _stale_task()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return TaskResponse.model_validate(db_task)
+    
+    @staticmethod
+    async def delete_task(db: AsyncSession, task_id: int, user_id: int, if_match: Optional[str] = None) -> dict:
+        """Delete task (412 if `if_match` is given and the task has changed since)"""
+        expected_updated_at = TaskService.parse_if_match(task_id, if_match)
+        success = await AsyncTaskRepository.delete(db, task_id, user_id, expected_updated_at)
+        if not success:
+            if expected_updated_at and await AsyncTaskRepository.get_by_id(db, task_id, user_id, load_description=False):
+                raise _stale_task()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
+        return {"message": "Task deleted successfully"}
+    
+    @staticmethod
+    async def bulk_write(db: AsyncSession, user_id: int, operations: list) -> dict:
+        """Apply a list of create/update/delete operations in one transaction"""
+        creates, updates, deletes, rejected = TaskService.plan_bulk(operations)
+        created, updated, deleted = await AsyncTaskRepository.bulk_write(db, user_id, creates, updates, deletes)
+        return TaskService.bulk_results(operations, rejected, created, updated, deleted)
+
+
+class AsyncAnalyticsService:
+    """Async service for task analytics"""
+    
+    @staticmethod
+    async def get_kpis(db: AsyncSession, user_id: int) -> dict:
+        """Build the KPI summary from the user's maintained task aggregates"""
+        stats, overdue_tasks, this_week_completed = await AsyncTaskStatsRepository.get_kpi_counts(
+            db, user_id, datetime.utcnow()
+        )
+        return AnalyticsService.build_kpis(stats, overdue_tasks, this_week_completed)
+
+
+class AsyncAuthService:
+    """Async service for authentication business logic"""
+    
+    @staticmethod
+    async def register_user(db: AsyncSession, user: UserCreate) -> dict:
+        """Register a new user"""
+        # Check if user already exists
+        if await AsyncUserRepository.get_by_username(db, user.username):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already registered"
+            )
+        
+        if await AsyncUserRepository.get_by_email(db, user.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
+        # Create user and queue the verification email in one transaction
+        hashed_password = await get_password_hash_async(user.password)
+        db_user = await AsyncUserRepository.add(db, user, hashed_password)
+        await db.run_sync(AuthService.queue_verification_email, db_user)
+        await db.commit()
+        
+        return AuthService.token_response(db_user)
+    
+    @staticmethod
+    async def login_user(db: AsyncSession, credentials: UserLogin) -> dict:
+        """Authenticate user and return token"""
+        # Get user by username
+        user = await AsyncUserRepository.get_by_username(db, credentials.username)
+        
+        if not user or not await verify_password_async(credentials.password, user.hashed_password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+        
+        # Upgrade the stored hash if the configured bcrypt cost changed
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = await get_password_hash_async(credentials.password)
+            await db.commit()
+        
+        return AuthService.token_response(user)
+    
+    @staticmethod
+    async def get_current_user(db: AsyncSession, user_id: int) -> User:
+        """Get current authenticated user"""
+        user = await AsyncUserRepository.get_by_id(db, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials"
+            )
+        return user
+
+
+class AsyncDashboardService:
+    """Async service for the composite dashboard payload"""
+    
+    @staticmethod
+    async def get_dashboard(db: AsyncSession, user_id: int, slices: List[str], limit: int) -> dict:
+        """Load the user, KPIs and task slices in one session (see DashboardService)"""
+        return await db.run_sync(DashboardService.get_dashboard, user_id, slices, limit)
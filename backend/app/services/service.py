@@ -2,22 +2,92 @@
 Service layer for business logic
 """
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from fastapi import HTTPException, status
-from app.repositories.repository import TaskRepository, UserRepository
-from app.schemas.schemas import TaskCreate, TaskUpdate, TaskResponse, UserCreate, UserLogin
+from typing import Optional, List, Iterator
+from fastapi import HTTPException, Response, status
+from app.repositories.repository import (
+    TaskRepository, UserRepository, TaskStatsRepository, OutboxRepository,
+    SORTABLE_COLUMNS, DASHBOARD_SLICES, TASK_COLUMNS, TASK_FIELDS
+)
+from app.repositories.search import TaskSearch
+from app.schemas.schemas import (
+    TaskCreate, TaskUpdate, TaskResponse, UserCreate, UserResponse, UserLogin, BulkCreate, BulkUpdate, BulkItemResult
+)
 from app.models.models import TaskStatus, TaskPriority, User
-from app.core.security import verify_password, create_access_token
-from datetime import timedelta
+from app.core.security import verify_password, create_access_token, get_password_hash, password_needs_rehash
+from datetime import timedelta, datetime
 from app.core.config import settings
-from app.core.email import EmailService
+from app.core.compression import identity_etag
+import base64
+import csv
+import hashlib
+import io
 import secrets
+import json
 import math
+import orjson
+
+
+def _encode_cursor(sort_by: str, sort_order: str, value, task_id: int) -> str:
+    """Encode the last row's sort key and id as an opaque page cursor"""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, (TaskStatus, TaskPriority)):
+        value = value.value
+    raw = json.dumps([sort_by, sort_order, value, task_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple:
+    """
+    Decode a page cursor back into (sort_value, task_id)
+    
+    Raises HTTPException 400 if the cursor is malformed or was issued
+    for a different sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_order, value, task_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        if cursor_sort_by != sort_by or cursor_order != sort_order:
+            raise ValueError("cursor was issued for a different sort")
+        if value is not None:
+            if sort_by == "relevance":
+                value = float(value)
+            elif sort_by == "status":
+                value = TaskStatus(value)
+            elif sort_by == "priority":
+                value = TaskPriority(value)
+            elif sort_by != "title":
+                value = datetime.fromisoformat(value)
+        return value, int(task_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _stale_task() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Task was modified since it was fetched"
+    )
 
 
 class TaskService:
     """Service for task business logic"""
     
+    # Most ids a single batch read may ask for
+    MAX_BATCH_IDS = 500
+    
+    # Task responses carry ETags; clients may keep them but must revalidate
+    CACHE_CONTROL = "private, no-cache"
+    
+    # Export: rows per keyset page, and the media type per format
+    EXPORT_PAGE_SIZE = 1000
+    EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+    
     @staticmethod
     def create_task(db: Session, task: TaskCreate, user_id: int) -> TaskResponse:
         """Create a new task"""
@@ -25,15 +95,75 @@ class TaskService:
         return TaskResponse.model_validate(db_task)
     
     @staticmethod
-    def get_task(db: Session, task_id: int, user_id: int) -> TaskResponse:
-        """Get task by ID"""
-        db_task = TaskRepository.get_by_id(db, task_id, user_id)
-        if not db_task:
+    def get_task(db: Session, task_id: int, user_id: int) -> dict:
+        """Get task by ID (read path: a serialized row, see to_dict)"""
+        row = TaskRepository.get_row(db, task_id, user_id)
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
-        return TaskResponse.model_validate(db_task)
+        return TaskService.to_dict(row)
+    
+    @staticmethod
+    def to_dict(row, fields: Optional[List[str]] = None) -> dict:
+        """
+        Serialize a task row from the read path into a TaskResponse-shaped dict
+        
+        The dict goes straight to ORJSONResponse (which handles datetimes and
+        enums), skipping Pydantic validation of data read from our own tables.
+        With `fields`, only those (plus id) are kept. `snippet` is only added
+        when one was read (a search with highlight=true).
+        """
+        task = row._asdict()
+        task.pop("search_rank", None)
+        highlighted = "snippet" in task
+        snippet = TaskSearch.render_snippet(task.pop("snippet", None))
+        if fields is not None:
+            task = {name: task[name] for name in TASK_FIELDS if name == "id" or name in fields}
+        if highlighted:
+            task["snippet"] = snippet
+        return task
+    
+    @staticmethod
+    def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        """Parse a comma-separated sparse fieldset, rejecting unknown names (None: all fields)"""
+        if fields is None:
+            return None
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in TASK_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(TASK_FIELDS)}"
+            )
+        return names
+    
+    @staticmethod
+    def get_tasks_by_ids(db: Session, task_ids: List[int], user_id: int) -> dict:
+        """Get many tasks by ID in request order, marking ids that weren't found"""
+        TaskService.check_batch_size(task_ids)
+        return TaskService.batch_results(task_ids, TaskRepository.get_many(db, task_ids, user_id))
+    
+    @staticmethod
+    def check_batch_size(task_ids: List[int]) -> None:
+        """Reject batch reads over MAX_BATCH_IDS ids"""
+        if len(task_ids) > TaskService.MAX_BATCH_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {TaskService.MAX_BATCH_IDS} ids per request"
+            )
+    
+    @staticmethod
+    def batch_results(task_ids: List[int], tasks: dict) -> dict:
+        """Build a batch read response, in request order, from tasks keyed by id"""
+        serialized = {task_id: TaskService.to_dict(row) for task_id, row in tasks.items()}
+        return {
+            "results": [
+                {"id": task_id, "found": task_id in serialized, "task": serialized.get(task_id)}
+                for task_id in task_ids
+            ]
+        }
     
     @staticmethod
     def get_tasks(
@@ -44,42 +174,167 @@ class TaskService:
         search: Optional[str] = None,
         status_filter: Optional[TaskStatus] = None,
         priority_filter: Optional[TaskPriority] = None,
-        sort_by: str = "created_at",
-        sort_order: str = "desc"
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        highlight: bool = False,
+        fields: Optional[List[str]] = None
     ) -> dict:
-        """Get all tasks with pagination and filters"""
+        """
+        Get all tasks with pagination and filters
+        
+        Pages by offset unless a `cursor` (the `next_cursor` of a previous
+        page) is given, in which case the page is read with a keyset
+        predicate. `include_total=False` skips counting the filtered rows.
+        
+        Searches are ordered by relevance unless another sort is requested.
+        `fields` (see parse_fields) limits both the selected columns and the
+        serialized tasks, so e.g. descriptions aren't read for a title list.
+        """
+        sort_by = TaskService.resolve_sort(TaskSearch.can_rank(db, search), sort_by)
+        after = _decode_cursor(cursor, sort_by, sort_order) if cursor else None
+        
         # Calculate skip
         skip = (page - 1) * page_size
         
-        # Get tasks and total count
+        # Fetch one extra row to know whether a next page exists
         tasks, total = TaskRepository.get_all(
             db=db,
             user_id=user_id,
             skip=skip,
-            limit=page_size,
+            limit=page_size + 1,
             search=search,
             status=status_filter,
             priority=priority_filter,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            after=after,
+            with_total=include_total,
+            highlight=highlight,
+            fields=fields
         )
         
+        return TaskService.build_page(tasks, total, page, page_size, sort_by, sort_order, cursor, fields)
+    
+    @staticmethod
+    def export_tasks(
+        db: Session,
+        user_id: int,
+        export_format: str,
+        search: Optional[str] = None,
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream all of the user's matching tasks, newest first, as CSV or NDJSON
+        
+        Reads keyset pages of EXPORT_PAGE_SIZE rows through the list read
+        path, so memory stays flat however many tasks are exported.
+        """
+        yield TaskService.export_header(export_format)
+        after = None
+        while True:
+            rows, _ = TaskRepository.get_all(
+                db,
+                user_id,
+                limit=TaskService.EXPORT_PAGE_SIZE,
+                search=search,
+                status=status_filter,
+                priority=priority_filter,
+                after=after,
+                with_total=False
+            )
+            if rows:
+                yield TaskService.render_export(rows, export_format)
+            if len(rows) < TaskService.EXPORT_PAGE_SIZE:
+                return
+            after = (rows[-1].created_at, rows[-1].id)
+    
+    @staticmethod
+    def export_header(export_format: str) -> bytes:
+        """First chunk of an export (the CSV header row)"""
+        if export_format != "csv":
+            return b""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(column.name for column in TASK_COLUMNS)
+        return buffer.getvalue().encode()
+    
+    @staticmethod
+    def render_export(rows: list, export_format: str) -> bytes:
+        """Render one page of task rows as CSV or NDJSON"""
+        if export_format == "ndjson":
+            return b"".join(orjson.dumps(TaskService.to_dict(row)) + b"\n" for row in rows)
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(
+                "" if value is None
+                else value.isoformat() if isinstance(value, datetime)
+                else value.value if isinstance(value, (TaskStatus, TaskPriority))
+                else value
+                for value in row[:len(TASK_COLUMNS)]
+            )
+        return buffer.getvalue().encode()
+    
+    @staticmethod
+    def resolve_sort(can_rank: bool, sort_by: Optional[str]) -> str:
+        """Pick the effective sort: relevance for ranked searches, else a sortable column"""
+        if sort_by is None:
+            sort_by = "relevance" if can_rank else "created_at"
+        if sort_by not in SORTABLE_COLUMNS and not (sort_by == "relevance" and can_rank):
+            sort_by = "created_at"
+        return sort_by
+    
+    @staticmethod
+    def build_page(
+        tasks: list,
+        total: Optional[int],
+        page: int,
+        page_size: int,
+        sort_by: str,
+        sort_order: str,
+        cursor: Optional[str],
+        fields: Optional[List[str]] = None
+    ) -> dict:
+        """Assemble a task list response from a page fetched with one extra row"""
+        next_cursor = None
+        if len(tasks) > page_size:
+            tasks = tasks[:page_size]
+            last = tasks[-1]
+            sort_value = last.search_rank if sort_by == "relevance" else getattr(last, sort_by)
+            next_cursor = _encode_cursor(sort_by, sort_order, sort_value, last.id)
+        
         # Calculate total pages
-        total_pages = math.ceil(total / page_size) if total > 0 else 1
+        if total is None:
+            total_pages = None
+        else:
+            total_pages = math.ceil(total / page_size) if total > 0 else 1
         
         return {
-            "tasks": [TaskResponse.model_validate(task) for task in tasks],
+            "tasks": [TaskService.to_dict(task, fields) for task in tasks],
             "total": total,
-            "page": page,
+            "page": None if cursor else page,
             "page_size": page_size,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
         }
     
     @staticmethod
-    def update_task(db: Session, task_id: int, user_id: int, task_update: TaskUpdate) -> TaskResponse:
-        """Update task"""
-        db_task = TaskRepository.update(db, task_id, user_id, task_update)
+    def update_task(
+        db: Session,
+        task_id: int,
+        user_id: int,
+        task_update: TaskUpdate,
+        if_match: Optional[str] = None
+    ) -> TaskResponse:
+        """Update task (412 if `if_match` is given and the task has changed since)"""
+        expected_updated_at = TaskService.parse_if_match(task_id, if_match)
+        db_task = TaskRepository.update(db, task_id, user_id, task_update, expected_updated_at)
         if not db_task:
+            if expected_updated_at and TaskRepository.get_by_id(db, task_id, user_id, load_description=False):
+                raise _stale_task()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
@@ -87,20 +342,252 @@ class TaskService:
         return TaskResponse.model_validate(db_task)
     
     @staticmethod
-    def delete_task(db: Session, task_id: int, user_id: int) -> dict:
-        """Delete task"""
-        success = TaskRepository.delete(db, task_id, user_id)
+    def delete_task(db: Session, task_id: int, user_id: int, if_match: Optional[str] = None) -> dict:
+        """Delete task (412 if `if_match` is given and the task has changed since)"""
+        expected_updated_at = TaskService.parse_if_match(task_id, if_match)
+        success = TaskRepository.delete(db, task_id, user_id, expected_updated_at)
         if not success:
+            if expected_updated_at and TaskRepository.get_by_id(db, task_id, user_id, load_description=False):
+                raise _stale_task()
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Task not found"
             )
         return {"message": "Task deleted successfully"}
+    
+    @staticmethod
+    def task_etag(task_id: int, updated_at: datetime) -> str:
+        """Strong ETag for a single task, derived from its id and updated_at"""
+        return f'"{task_id}-{updated_at.strftime("%Y%m%d%H%M%S%f")}"'
+    
+    @staticmethod
+    def parse_if_match(task_id: int, if_match: Optional[str]) -> Optional[datetime]:
+        """
+        Turn an If-Match header into the updated_at the task must still have
+        
+        Returns None when there is no precondition (no header, or `*`).
+        Raises 412 for an ETag that can't belong to this task. The ETag of a
+        compressed response (with its encoding suffix) is accepted too.
+        """
+        if not if_match or if_match.strip() == "*":
+            return None
+        try:
+            etag_task_id, stamp = identity_etag(if_match).strip('"').split("-")
+            if int(etag_task_id) != task_id:
+                raise ValueError("ETag is for another task")
+            return datetime.strptime(stamp, "%Y%m%d%H%M%S%f")
+        except ValueError:
+            raise _stale_task()
+    
+    @staticmethod
+    def get_data_version(db: Session, user_id: int) -> int:
+        """The user's task change version, for list ETags and the response cache (one primary-key lookup)"""
+        return TaskStatsRepository.get_version(db, user_id)
+    
+    @staticmethod
+    def list_etag(user_id: int, version: int, query: str) -> str:
+        """Weak ETag for a task list: the user's change version plus the query string"""
+        digest = hashlib.sha1(f"{user_id}:{version}:{query}".encode()).hexdigest()[:24]
+        return f'W/"{digest}"'
+    
+    @staticmethod
+    def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        """Weak comparison of an If-None-Match header against an ETag (ignoring encoding suffixes)"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(identity_etag(candidate).removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+    
+    @staticmethod
+    def not_modified(etag: str) -> Response:
+        """Empty 304 response carrying the current ETag"""
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": TaskService.CACHE_CONTROL}
+        )
+    
+    @staticmethod
+    def bulk_write(db: Session, user_id: int, operations: list) -> dict:
+        """Apply a list of create/update/delete operations in one transaction"""
+        creates, updates, deletes, rejected = TaskService.plan_bulk(operations)
+        created, updated, deleted = TaskRepository.bulk_write(db, user_id, creates, updates, deletes)
+        return TaskService.bulk_results(operations, rejected, created, updated, deleted)
+    
+    @staticmethod
+    def plan_bulk(operations: list) -> tuple:
+        """
+        Split bulk operations into creates, updates and deletes
+        
+        A task id may appear in only one operation per request; repeats are
+        rejected (409) rather than applied in an order-dependent way.
+        
+        Returns:
+            Tuple of (creates, updates by id, delete ids, rejected indexes)
+        """
+        creates = []
+        updates = {}
+        deletes = []
+        seen = set()
+        rejected = set()
+        for index, operation in enumerate(operations):
+            if isinstance(operation, BulkCreate):
+                creates.append(operation.task)
+                continue
+            if operation.id in seen:
+                rejected.add(index)
+                continue
+            seen.add(operation.id)
+            if isinstance(operation, BulkUpdate):
+                updates[operation.id] = operation.changes.model_dump(exclude_unset=True)
+            else:
+                deletes.append(operation.id)
+        return creates, updates, deletes, rejected
+    
+    @staticmethod
+    def bulk_results(operations: list, rejected: set, created: list, updated: dict, deleted: set) -> dict:
+        """Build per-item results, in request order, for a bulk write"""
+        created_tasks = iter(created)
+        results = []
+        for index, operation in enumerate(operations):
+            if isinstance(operation, BulkCreate):
+                task = next(created_tasks)
+                result = BulkItemResult(
+                    index=index, op="create", id=task.id, status=status.HTTP_201_CREATED,
+                    task=TaskResponse.model_validate(task)
+                )
+            elif index in rejected:
+                result = BulkItemResult(
+                    index=index, op=operation.op, id=operation.id, status=status.HTTP_409_CONFLICT,
+                    error="Task already targeted by another operation in this request"
+                )
+            elif operation.id in updated or operation.id in deleted:
+                task = updated.get(operation.id)
+                result = BulkItemResult(
+                    index=index, op=operation.op, id=operation.id, status=status.HTTP_200_OK,
+                    task=TaskResponse.model_validate(task) if task is not None else None
+                )
+            else:
+                result = BulkItemResult(
+                    index=index, op=operation.op, id=operation.id, status=status.HTTP_404_NOT_FOUND,
+                    error="Task not found"
+                )
+            results.append(result)
+        return {"results": results}
+
+
+class AnalyticsService:
+    """Service for task analytics"""
+    
+    @staticmethod
+    def get_kpis(db: Session, user_id: int) -> dict:
+        """Build the KPI summary from the user's maintained task aggregates"""
+        stats, overdue_tasks, this_week_completed = TaskStatsRepository.get_kpi_counts(
+            db, user_id, datetime.utcnow()
+        )
+        return AnalyticsService.build_kpis(stats, overdue_tasks, this_week_completed)
+    
+    @staticmethod
+    def build_kpis(stats, overdue_tasks: int, this_week_completed: int) -> dict:
+        """Format aggregates and time-relative counts as the KPI payload"""
+        total_tasks = stats.total_tasks
+        
+        if total_tasks == 0:
+            return {
+                "total_tasks": 0,
+                "completed_tasks": 0,
+                "in_progress_tasks": 0,
+                "not_started_tasks": 0,
+                "completion_rate": 0,
+                "average_completion_days": 0,
+                "overdue_tasks": 0,
+                "tasks_by_priority": {"High": 0, "Medium": 0, "Low": 0},
+                "tasks_by_status": {"Not Started": 0, "In Progress": 0, "Completed": 0},
+                "this_week_completed": 0,
+                "on_time_completion_rate": 0
+            }
+        
+        completion_rate = stats.completed_tasks / total_tasks * 100
+        
+        if stats.completion_days_count:
+            average_completion_days = stats.completion_days_total / stats.completion_days_count
+        else:
+            average_completion_days = 0
+        
+        if stats.completed_with_due_date:
+            on_time_completion_rate = stats.completed_on_time / stats.completed_with_due_date * 100
+        else:
+            on_time_completion_rate = 0
+        
+        return {
+            "total_tasks": total_tasks,
+            "completed_tasks": stats.completed_tasks,
+            "in_progress_tasks": stats.in_progress_tasks,
+            "not_started_tasks": stats.not_started_tasks,
+            "completion_rate": round(completion_rate, 1),
+            "average_completion_days": round(average_completion_days, 1),
+            "overdue_tasks": overdue_tasks,
+            "tasks_by_priority": {
+                "High": stats.high_priority_tasks,
+                "Medium": stats.medium_priority_tasks,
+                "Low": stats.low_priority_tasks
+            },
+            "tasks_by_status": {
+                "Not Started": stats.not_started_tasks,
+                "In Progress": stats.in_progress_tasks,
+                "Completed": stats.completed_tasks
+            },
+            "this_week_completed": this_week_completed,
+            "on_time_completion_rate": round(on_time_completion_rate, 1)
+        }
 
 
 class AuthService:
     """Service for authentication business logic"""
     
+    @staticmethod
+    def token_response(user: User) -> dict:
+        """Issue an access token and build the login/registration response"""
+        access_token = create_access_token(
+            data={"sub": str(user.id)},
+            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        )
+        
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "is_verified": bool(user.is_verified),
+                "timezone": user.timezone
+            }
+        }
+    
+    @staticmethod
+    def queue_verification_email(db: Session, user: User) -> str:
+        """
+        Give the user a new verification token and queue the verification email
+        
+        Nothing is committed: the outbox row is written in the caller's
+        transaction, so the email goes out only if the change is committed.
+        Returns the new token.
+        """
+        verification_token = secrets.token_urlsafe(32)
+        user.verification_token = verification_token
+        OutboxRepository.enqueue(
+            db,
+            kind="verification",
+            to_email=user.email,
+            payload={
+                "username": user.username,
+                "verification_link": f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
+            }
+        )
+        return verification_token
+    
     @staticmethod
     def register_user(db: Session, user: UserCreate) -> dict:
         """Register a new user"""
@@ -117,39 +604,13 @@ class AuthService:
                 detail="Email already registered"
             )
         
-        # Create user with verification token
-        db_user = UserRepository.create(db, user)
-        
-        # Generate verification token
-        verification_token = secrets.token_urlsafe(32)
-        db_user.verification_token = verification_token
+        # Create user and queue the verification email in one transaction
+        db_user = UserRepository.add(db, user)
+        AuthService.queue_verification_email(db, db_user)
         db.commit()
+        db.refresh(db_user)
         
-        # Send verification email
-        EmailService.initialize()
-        verification_link = f"{settings.FRONTEND_URL}/verify-email?token={verification_token}"
-        EmailService.send_verification_email(
-            to_email=db_user.email,
-            username=db_user.username,
-            verification_link=verification_link
-        )
-        
-        # Create access token
-        access_token = create_access_token(
-            data={"sub": str(db_user.id)},
-            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        )
-        
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": db_user.id,
-                "username": db_user.username,
-                "email": db_user.email,
-                "is_verified": bool(db_user.is_verified)
-            }
-        }
+        return AuthService.token_response(db_user)
     
     @staticmethod
     def login_user(db: Session, credentials: UserLogin) -> dict:
@@ -164,22 +625,12 @@ class AuthService:
                 headers={"WWW-Authenticate": "Bearer"}
             )
         
-        # Create access token
-        access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        )
+        # Upgrade the stored hash if the configured bcrypt cost changed
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = get_password_hash(credentials.password)
+            db.commit()
         
-        return {
-            "access_token": access_token,
-            "token_type": "bearer",
-            "user": {
-                "id": user.id,
-                "username": user.username,
-                "email": user.email,
-                "is_verified": bool(user.is_verified)
-            }
-        }
+        return AuthService.token_response(user)
     
     @staticmethod
     def get_current_user(db: Session, user_id: int) -> User:
@@ -191,3 +642,48 @@ class AuthService:
                 detail="Could not validate credentials"
             )
         return user
+
+
+class DashboardService:
+    """Service for the composite dashboard payload"""
+    
+    DEFAULT_SLICES = "recent,due_soon"
+    
+    @staticmethod
+    def parse_slices(slices: str) -> List[str]:
+        """Parse a comma-separated slice list, rejecting unknown names"""
+        names = list(dict.fromkeys(name.strip() for name in slices.split(",") if name.strip()))
+        unknown = [name for name in names if name not in DASHBOARD_SLICES]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown slice(s): {', '.join(unknown)}. Available: {', '.join(DASHBOARD_SLICES)}"
+            )
+        return names
+    
+    @staticmethod
+    def get_dashboard(db: Session, user_id: int, slices: List[str], limit: int) -> dict:
+        """
+        Load the user, KPIs and task slices in one session
+        
+        Tasks are read as rows; one that appears in several slices is
+        serialized once.
+        """
+        user = AuthService.get_current_user(db, user_id)
+        now = datetime.utcnow()
+        stats, overdue_tasks, this_week_completed = TaskStatsRepository.get_kpi_counts(db, user_id, now)
+        
+        serialized = {}
+        task_slices = {}
+        for name in slices:
+            task_slices[name] = []
+            for row in TaskRepository.get_slice(db, user_id, name, limit, now):
+                if row.id not in serialized:
+                    serialized[row.id] = TaskService.to_dict(row)
+                task_slices[name].append(serialized[row.id])
+        
+        return {
+            "user": UserResponse.model_validate(user).model_dump(),
+            "kpis": AnalyticsService.build_kpis(stats, overdue_tasks, this_week_completed),
+            "slices": task_slices
+        }
@@ -0,0 +1,31 @@
+"""
+Standalone scheduler process
+
+Usage:
+    python -m app.worker
+
+Runs the reminder and email outbox jobs in the foreground, so the API
+workers can start with RUN_SCHEDULER=false. Several workers may run for
+redundancy: the scheduler lease lets only one of them run jobs at a time.
+"""
+import signal
+import sys
+from app.core.scheduler import start_scheduler, release_lease
+from app.core.outbox import shutdown_outbox_pool
+
+
+def main() -> None:
+    """Run the scheduler until interrupted (SIGINT or SIGTERM)"""
+    # Platforms stop workers with SIGTERM; exit cleanly so the lease is released
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        start_scheduler(blocking=True)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        release_lease()
+        shutdown_outbox_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Synthetic users and tasks for benchmarks
+
+Creates one user per requested size (`bench_<tasks>`, 10 to 1M tasks each)
+and bulk-inserts their tasks with core executemany in chunks, which is much
+faster than going through the ORM. Statuses, priorities and dates follow
+rough real-world distributions: mostly open tasks, more recent than old,
+a fifth without a due date, and overdue stragglers. Users that already exist
+with their full task count are reused, so large datasets are generated once.
+
+Usage (from backend/, against a scratch database):
+    DATABASE_URL=sqlite:///./benchmark.db python -m benchmarks.datagen --sizes 10,1000,100000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.manage import migrate
+from app.models.models import User, Task, TaskStatus, TaskPriority
+from app.core.security import get_password_hash
+from app.repositories.repository import TaskRepository, TaskStatsRepository
+from benchmarks.serialization import build_vocabulary
+
+MIN_TASKS = 10
+MAX_TASKS = 1_000_000
+CHUNK_SIZE = 10_000
+
+STATUS_WEIGHTS = {
+    TaskStatus.NOT_STARTED: 0.40,
+    TaskStatus.IN_PROGRESS: 0.25,
+    TaskStatus.COMPLETED: 0.35,
+}
+PRIORITY_WEIGHTS = {
+    TaskPriority.HIGH: 0.20,
+    TaskPriority.MEDIUM: 0.50,
+    TaskPriority.LOW: 0.30,
+}
+TIMEZONES = ["UTC", "Europe/London", "Europe/Berlin", "America/New_York", "America/Los_Angeles", "Asia/Kolkata", "Asia/Tokyo"]
+
+
+def parse_sizes(spec: str) -> List[int]:
+    """Parse a comma-separated list of tasks-per-user counts"""
+    sizes = sorted({int(part) for part in spec.split(",") if part.strip()})
+    for size in sizes:
+        if not MIN_TASKS <= size <= MAX_TASKS:
+            raise argparse.ArgumentTypeError(f"Task counts must be between {MIN_TASKS} and {MAX_TASKS}, got {size}")
+    return sizes
+
+
+def generate_tasks(rng: random.Random, vocabulary: List[str], user_id: int, count: int, now: datetime):
+    """Yield `count` task rows (dicts for the tasks table) for one user"""
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+    priorities, priority_weights = list(PRIORITY_WEIGHTS), list(PRIORITY_WEIGHTS.values())
+    
+    for _ in range(count):
+        status = rng.choices(statuses, status_weights)[0]
+        # Skewed towards recent tasks, going back at most two years
+        created_at = now - timedelta(days=min(rng.expovariate(1 / 90), 730), seconds=rng.randint(0, 86399))
+        start_date = created_at + timedelta(days=rng.randint(0, 3)) if rng.random() < 0.5 else None
+        due_date = None
+        if rng.random() < 0.8:
+            due_date = created_at + timedelta(days=rng.expovariate(1 / 14), hours=rng.randint(0, 23))
+            due_date = due_date.replace(minute=0, second=0, microsecond=0)
+        
+        age = (now - created_at).total_seconds()
+        if status == TaskStatus.COMPLETED:
+            # Mostly done before the due date, some late
+            span = (due_date - created_at).total_seconds() * 1.3 if due_date else age
+            updated_at = min(now, created_at + timedelta(seconds=rng.uniform(0, max(span, 60))))
+        else:
+            updated_at = created_at + timedelta(seconds=rng.uniform(0, age))
+        
+        description = None
+        if rng.random() < 0.6:
+            description = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(5, 60))).capitalize()
+        
+        task = {
+            "title": " ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6))).capitalize(),
+            "description": description,
+            "status": status,
+            "priority": rng.choices(priorities, priority_weights)[0],
+            "start_date": start_date,
+            "due_date": due_date,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "user_id": user_id,
+        }
+        task["next_reminder_at"] = TaskRepository.reminder_at(SimpleNamespace(**task), now)
+        yield task
+
+
+def _insert_tasks(db: Session, tasks) -> None:
+    chunk = []
+    for task in tasks:
+        chunk.append(task)
+        if len(chunk) == CHUNK_SIZE:
+            db.execute(Task.__table__.insert(), chunk)
+            chunk = []
+    if chunk:
+        db.execute(Task.__table__.insert(), chunk)
+
+
+def ensure_users(db: Session, sizes: List[int], seed: int = 42) -> Dict[int, int]:
+    """
+    Make sure a `bench_<size>` user with exactly `size` tasks exists for each size
+    
+    Returns {size: user_id}. A user with the wrong number of tasks (e.g.
+    from an interrupted run) is deleted and generated again.
+    """
+    users = {}
+    now = datetime.utcnow()
+    vocabulary = build_vocabulary(random.Random(seed))
+    hashed_password = None
+    
+    for size in sizes:
+        username = f"bench_{size}"
+        user = db.query(User).filter(User.username == username).first()
+        if user is not None:
+            if db.query(Task.id).filter(Task.user_id == user.id).count() == size:
+                users[size] = user.id
+                continue
+            db.query(Task).filter(Task.user_id == user.id).delete(synchronize_session=False)
+            db.delete(user)
+            db.commit()
+        
+        hashed_password = hashed_password or get_password_hash("benchmark")
+        rng = random.Random(f"{seed}:{size}")
+        user = User(
+            email=f"{username}@example.com",
+            username=username,
+            hashed_password=hashed_password,
+            is_verified=1,
+            timezone=rng.choice(TIMEZONES)
+        )
+        db.add(user)
+        db.flush()
+        
+        start = time.perf_counter()
+        _insert_tasks(db, generate_tasks(rng, vocabulary, user.id, size, now))
+        TaskStatsRepository.rebuild_user(db, user.id)
+        db.commit()
+        print(f"  {username}: {size} tasks in {time.perf_counter() - start:.1f}s")
+        users[size] = user.id
+    
+    return users
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("10,1000,100000"))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    migrate()
+    db = SessionLocal()
+    try:
+        users = ensure_users(db, args.sizes, args.seed)
+    finally:
+        db.close()
+    print(f"✅ Benchmark users ready: {', '.join(f'bench_{size} (id {user_id})' for size, user_id in users.items())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Local stand-in for the Resend email API
+
+Accepts the requests EmailService makes (POST /emails and POST
+/emails/batch), answers like Resend does, and keeps the messages in memory
+instead of delivering them, so registration, the email outbox and the
+reminder jobs can be exercised offline and under load. Optional latency and
+failure rate simulate a slow or flaky provider. GET /stats returns counters
+and GET /emails the most recently received messages.
+
+Usage (from backend/):
+    python -m benchmarks.fake_resend --port 8025 --latency-ms 50 --failure-rate 0.01
+    RESEND_API_URL=http://localhost:8025 RESEND_API_KEY=re_fake uvicorn app.main:app
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeResendServer(ThreadingHTTPServer):
+    """HTTP server holding the fake provider's settings and received emails"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address: tuple, latency_ms: float = 0, failure_rate: float = 0, keep: int = 1000):
+        super().__init__(address, FakeResendHandler)
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.emails = deque(maxlen=keep)
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "emails": 0, "batches": 0, "failures": 0}
+    
+    def record(self, emails: list, batch: bool) -> list:
+        """Store accepted emails; returns their generated ids"""
+        ids = [str(uuid.uuid4()) for _ in emails]
+        with self.lock:
+            self.emails.extend({"id": email_id, **email} for email_id, email in zip(ids, emails))
+            self.counters["emails"] += len(emails)
+            self.counters["batches"] += batch
+        return ids
+
+
+class FakeResendHandler(BaseHTTPRequestHandler):
+    """Implements the subset of the Resend API used by app.core.email"""
+    
+    server: FakeResendServer
+    
+    def do_POST(self):
+        with self.server.lock:
+            self.server.counters["requests"] += 1
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        
+        if not self.headers.get("Authorization", "").startswith("Bearer re_"):
+            return self._send_error(401, "missing_api_key", "Missing or invalid API key")
+        if random.random() < self.server.failure_rate:
+            with self.server.lock:
+                self.server.counters["failures"] += 1
+            return self._send_error(500, "application_error", "Simulated provider failure")
+        
+        try:
+            payload = json.loads(body or b"null")
+        except json.JSONDecodeError:
+            return self._send_error(422, "validation_error", "Invalid JSON body")
+        
+        if self.path == "/emails" and isinstance(payload, dict):
+            return self._send_json(200, {"id": self.server.record([payload], batch=False)[0]})
+        if self.path == "/emails/batch" and isinstance(payload, list):
+            ids = self.server.record(payload, batch=True)
+            return self._send_json(200, {"data": [{"id": email_id} for email_id in ids]})
+        self._send_error(404, "not_found", f"No route for POST {self.path}")
+    
+    def do_GET(self):
+        if self.path == "/stats":
+            with self.server.lock:
+                return self._send_json(200, dict(self.server.counters))
+        if self.path == "/emails":
+            with self.server.lock:
+                return self._send_json(200, {"data": list(self.server.emails)[-50:]})
+        self._send_error(404, "not_found", f"No route for GET {self.path}")
+    
+    def _send_error(self, status: int, name: str, message: str) -> None:
+        self._send_json(status, {"statusCode": status, "name": name, "message": message})
+    
+    def _send_json(self, status: int, data) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # One line per request would dominate the output under load
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0)
+    args = parser.parse_args()
+    
+    server = FakeResendServer((args.host, args.port), args.latency_ms, args.failure_rate)
+    print(f"📮 Fake Resend API on http://{args.host}:{args.port} (set RESEND_API_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📮 {server.counters}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+End-to-end HTTP load generator
+
+Drives a running app with concurrent virtual users. Each user registers,
+logs in, then repeats a weighted mix of journey steps (create, list,
+search, update, KPIs) until the run ends. Reports throughput, error counts
+and p50/p95/p99 latency per route, and optionally writes them as JSON.
+
+Registration queues a verification email; run the app against
+benchmarks.fake_resend so the outbox sends it without leaving the machine.
+
+Usage (from backend/, with the app running):
+    python -m benchmarks.fake_resend &
+    RESEND_API_URL=http://localhost:8025 RESEND_API_KEY=re_fake uvicorn app.main:app --port 8000 &
+    python -m benchmarks.load --base-url http://localhost:8000 --users 50 --duration 60 \\
+        --journey create=3,list=5,search=2,update=2,kpis=1
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import httpx
+from app.schemas.schemas import TaskStatus, TaskPriority
+from benchmarks.serialization import build_vocabulary
+
+JOURNEY_STEPS = ("create", "list", "search", "update", "kpis")
+
+
+def parse_journey(spec: str) -> Dict[str, int]:
+    """Parse step weights like "create=3,list=5,kpis=1" (unlisted steps don't run)"""
+    weights = {}
+    for part in spec.split(","):
+        step, _, weight = part.strip().partition("=")
+        if step not in JOURNEY_STEPS or not weight.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"Invalid journey step {part!r}; expected <step>=<weight> with step in {', '.join(JOURNEY_STEPS)}"
+            )
+        weights[step] = int(weight)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("At least one journey step needs a positive weight")
+    return weights
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+class LoadStats:
+    """Latencies and status codes per route"""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+    
+    def record(self, route: str, status: int, seconds: float) -> None:
+        self.latencies[route].append(seconds * 1000)
+        self.statuses[route][status] += 1
+    
+    def report(self, elapsed: float) -> dict:
+        routes = {}
+        for route, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            statuses = self.statuses[route]
+            routes[route] = {
+                "requests": len(latencies),
+                "errors": sum(count for status, count in statuses.items() if status >= 400 or status == 0),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "max_ms": round(latencies[-1], 2),
+                "statuses": {str(status): count for status, count in sorted(statuses.items())},
+            }
+        total = sum(route["requests"] for route in routes.values())
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "requests": total,
+            "errors": sum(route["errors"] for route in routes.values()),
+            "throughput_rps": round(total / elapsed, 2),
+            "routes": routes,
+        }
+
+
+class VirtualUser:
+    """One simulated user walking the journey with its own account and tasks"""
+    
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats, name: str, rng: random.Random, vocabulary: List[str]):
+        self.client = client
+        self.stats = stats
+        self.name = name
+        self.rng = rng
+        self.vocabulary = vocabulary
+        self.headers: Dict[str, str] = {}
+        self.task_ids: List[int] = []
+    
+    async def request(self, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record its latency under `route` (status 0 for transport errors)"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(route, 0, time.perf_counter() - start)
+            return None
+        self.stats.record(route, response.status_code, time.perf_counter() - start)
+        return response
+    
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(self.vocabulary) for _ in range(count))
+    
+    async def sign_up(self) -> bool:
+        """Register and log in; returns whether the user has a token"""
+        password = "loadtest123"
+        await self.request("POST /api/auth/register", "POST", "/api/auth/register", json={
+            "email": f"{self.name}@example.com",
+            "username": self.name,
+            "password": password,
+        })
+        response = await self.request("POST /api/auth/login", "POST", "/api/auth/login", json={
+            "username": self.name,
+            "password": password,
+        })
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+    
+    async def create_task(self) -> None:
+        due_date = datetime.utcnow() + timedelta(hours=self.rng.randint(1, 24 * 30))
+        response = await self.request("POST /api/tasks/", "POST", "/api/tasks/", json={
+            "title": self.words(self.rng.randint(2, 6)).capitalize(),
+            "description": self.words(self.rng.randint(5, 60)).capitalize(),
+            "priority": self.rng.choice(list(TaskPriority)).value,
+            "due_date": due_date.isoformat() if self.rng.random() < 0.8 else None,
+        })
+        if response is not None and response.status_code == 201:
+            self.task_ids.append(response.json()["id"])
+    
+    async def list_tasks(self) -> None:
+        params = {"page": 1, "page_size": 10}
+        if self.rng.random() < 0.3:
+            params["status"] = self.rng.choice(list(TaskStatus)).value
+        await self.request("GET /api/tasks/", "GET", "/api/tasks/", params=params)
+    
+    async def search_tasks(self) -> None:
+        await self.request("GET /api/tasks/?search", "GET", "/api/tasks/", params={"search": self.words(1)})
+    
+    async def update_task(self) -> None:
+        if not self.task_ids:
+            return await self.create_task()
+        task_id = self.rng.choice(self.task_ids)
+        await self.request("PUT /api/tasks/{id}", "PUT", f"/api/tasks/{task_id}", json={
+            "status": self.rng.choice(list(TaskStatus)).value,
+        })
+    
+    async def get_kpis(self) -> None:
+        await self.request("GET /api/analytics/kpis", "GET", "/api/analytics/kpis")
+    
+    async def run(self, journey: Dict[str, int], deadline: float, think_time: float) -> None:
+        if not await self.sign_up():
+            return
+        actions = {
+            "create": self.create_task,
+            "list": self.list_tasks,
+            "search": self.search_tasks,
+            "update": self.update_task,
+            "kpis": self.get_kpis,
+        }
+        steps, weights = list(journey), list(journey.values())
+        while time.monotonic() < deadline:
+            await actions[self.rng.choices(steps, weights)[0]]()
+            if think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+
+async def run_load(args) -> dict:
+    """Run the virtual users against args.base_url and return the report"""
+    stats = LoadStats()
+    run_id = uuid.uuid4().hex[:8]
+    vocabulary = build_vocabulary(random.Random(args.seed))
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        start = time.monotonic()
+        deadline = start + args.ramp_up + args.duration
+        
+        async def start_user(number: int) -> None:
+            # Spread user start-up (registration is CPU heavy) over the ramp-up
+            await asyncio.sleep(args.ramp_up * number / args.users)
+            user = VirtualUser(client, stats, f"load_{run_id}_{number}", random.Random(f"{args.seed}:{number}"), vocabulary)
+            await user.run(args.journey, deadline, args.think_time_ms / 1000)
+        
+        await asyncio.gather(*(start_user(number) for number in range(args.users)))
+        elapsed = time.monotonic() - start
+    
+    report = stats.report(elapsed)
+    report.update({
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration_seconds": args.duration,
+        "journey": args.journey,
+        "created_at": datetime.utcnow().isoformat(),
+    })
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{report['requests']} requests in {report['elapsed_seconds']}s "
+          f"({report['throughput_rps']} req/s, {report['errors']} errors)\n")
+    print(f"  {'route':<28} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, result in report["routes"].items():
+        print(
+            f"  {route:<28} {result['requests']:>9} {result['errors']:>7} {result['throughput_rps']:>8.2f} "
+            f"{result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=5, help="Seconds over which users start")
+    parser.add_argument("--journey", type=parse_journey, default=parse_journey("create=3,list=5,search=2,update=2,kpis=1"))
+    parser.add_argument("--think-time-ms", type=float, default=0, help="Mean pause between a user's steps")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Also write the report as JSON to this file")
+    args = parser.parse_args()
+    
+    print(f"🚦 {args.users} users against {args.base_url} for {args.duration}s (+{args.ramp_up}s ramp-up)")
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"\n📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
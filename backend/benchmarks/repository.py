@@ -0,0 +1,259 @@
+"""
+Benchmark repository and service hot paths against synthetic data
+
+Generates (or reuses) benchmark users with the given task counts (see
+benchmarks.datagen), then measures wall-clock time per call for:
+  - TaskRepository.get_all under every status x priority x sort x order
+    combination (plus a search term, with --search)
+  - TaskService.get_tasks for a default first page (query + serialization)
+  - AnalyticsService.get_kpis
+  - the scheduler scans: daily pending reminders, the next_reminder_at
+    dispatcher batch and the per-timezone bucket lookup
+  - the auth dependency (get_current_user_id) with a warm and a cold token
+    cache, and JWT decoding on its own
+
+Results are written as JSON (commit, database, and per benchmark the
+median/min/max milliseconds) so runs on different commits can be compared;
+--compare prints the benchmarks that got slower than a baseline file and
+exits non-zero if any did.
+
+Usage (from backend/, against a scratch database):
+    DATABASE_URL=sqlite:///./benchmark.db python -m benchmarks.repository --sizes 10,1000,100000
+    DATABASE_URL=sqlite:///./benchmark.db python -m benchmarks.repository --compare before.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import case
+from sqlalchemy.orm import Session
+from app.api.dependencies import get_current_user_id
+from app.core.config import settings
+from app.core.reminders import daily_digest_windows
+from app.core.security import create_access_token, decode_token
+from app.core.token_cache import token_cache
+from app.db.database import SessionLocal, DB_PROFILE
+from app.manage import migrate
+from app.models.models import Task, TaskStatus, TaskPriority
+from app.repositories.repository import (
+    SORTABLE_COLUMNS,
+    NotificationRepository,
+    TaskRepository,
+    UserRepository,
+)
+from app.services.service import TaskService, AnalyticsService
+from benchmarks.datagen import ensure_users, parse_sizes
+
+
+def measure(function: Callable[[], object], repeat: int) -> dict:
+    """Time `function` (after one warm-up call): median/min/max milliseconds"""
+    result = function()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    measurement = {
+        "median_ms": round(statistics.median(timings), 4),
+        "min_ms": round(min(timings), 4),
+        "max_ms": round(max(timings), 4),
+        "repeat": repeat,
+    }
+    if isinstance(result, (list, tuple)):
+        measurement["rows"] = len(result[0]) if isinstance(result, tuple) else len(result)
+    return measurement
+
+
+def bench_get_all(db: Session, user_id: int, repeat: int, search: Optional[str]):
+    """TaskRepository.get_all as the list endpoint calls it, for every filter and sort"""
+    combinations = itertools.product(
+        [None, search] if search else [None],
+        [None, *TaskStatus],
+        [None, *TaskPriority],
+        SORTABLE_COLUMNS,
+        ["asc", "desc"],
+    )
+    for search_term, status, priority, sort_by, sort_order in combinations:
+        params = {
+            "search": search_term,
+            "status": status.value if status else None,
+            "priority": priority.value if priority else None,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+        }
+        yield "TaskRepository.get_all", params, measure(
+            lambda: TaskRepository.get_all(
+                db, user_id, limit=11, search=search_term, status=status,
+                priority=priority, sort_by=sort_by, sort_order=sort_order
+            ),
+            repeat
+        )
+
+
+def bench_user(db: Session, user_id: int, repeat: int):
+    """Per-user service calls: the default task page and KPIs"""
+    yield "TaskService.get_tasks", {"page": 1, "page_size": 10}, measure(
+        lambda: TaskService.get_tasks(db, user_id), repeat
+    )
+    yield "AnalyticsService.get_kpis", {}, measure(
+        lambda: AnalyticsService.get_kpis(db, user_id), repeat
+    )
+
+
+def bench_scheduler(db: Session, repeat: int):
+    """The scans the scheduled reminder jobs run, over every user's tasks"""
+    now = datetime.utcnow()
+    today = datetime.combine(now.date(), datetime.min.time())
+    tomorrow = today + timedelta(days=1)
+    notification_type = case((Task.due_date < tomorrow, "due_today"), else_="due_1_day")
+    
+    yield "NotificationRepository.get_pending_reminders", {"days": 2}, measure(
+        lambda: NotificationRepository.get_pending_reminders(
+            db, today, tomorrow + timedelta(days=1), notification_type
+        ),
+        repeat
+    )
+    yield "NotificationRepository.get_due_reminders", {"limit": settings.REMINDER_DISPATCH_BATCH_SIZE}, measure(
+        lambda: NotificationRepository.get_due_reminders(
+            db, now + timedelta(days=1), settings.REMINDER_DISPATCH_BATCH_SIZE
+        ),
+        repeat
+    )
+    yield "daily_digest_windows", {}, measure(
+        lambda: daily_digest_windows(UserRepository.get_timezones(db), today, settings.DAILY_REMINDER_HOUR),
+        repeat
+    )
+
+
+def bench_auth(user_id: int, repeat: int):
+    """The auth dependency, each call with its own session like a request"""
+    token = create_access_token({"sub": str(user_id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    
+    def authenticate(cold: bool) -> int:
+        if cold:
+            token_cache.clear()
+        with SessionLocal() as session:
+            return get_current_user_id(credentials, session)
+    
+    yield "decode_token", {}, measure(lambda: decode_token(token), repeat)
+    yield "get_current_user_id", {"token_cache": "cold"}, measure(lambda: authenticate(True), repeat)
+    yield "get_current_user_id", {"token_cache": "warm"}, measure(lambda: authenticate(False), repeat)
+
+
+def result_key(result: dict) -> tuple:
+    return result["benchmark"], result["tasks"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results: list, baseline_path: str, threshold: float, min_delta_ms: float) -> int:
+    """
+    Print benchmarks more than `threshold` times slower than the baseline; returns their count
+    
+    Slowdowns under `min_delta_ms` are ignored, so sub-millisecond timer
+    noise isn't reported.
+    """
+    with open(baseline_path) as baseline_file:
+        baseline = {result_key(result): result for result in json.load(baseline_file)["results"]}
+    regressions = 0
+    for result in results:
+        before = baseline.get(result_key(result))
+        if before is None or before["median_ms"] <= 0:
+            continue
+        ratio = result["median_ms"] / before["median_ms"]
+        if ratio > threshold and result["median_ms"] - before["median_ms"] >= min_delta_ms:
+            regressions += 1
+            print(
+                f"  ❌ {result['benchmark']} ({result['tasks']} tasks) {result['params']}: "
+                f"{before['median_ms']:.3f} -> {result['median_ms']:.3f} ms ({ratio:.2f}x)"
+            )
+    print(f"\n{regressions} regression(s) over {threshold:.2f}x against {baseline_path}")
+    return regressions
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("10,1000,100000"))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--search", default=None, help="Also benchmark get_all with this search term")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="Baseline results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    
+    migrate()
+    db = SessionLocal()
+    try:
+        print("Preparing benchmark users")
+        users = ensure_users(db, args.sizes, args.seed)
+        total_tasks = db.query(Task.id).count()
+        database = db.get_bind().dialect.name
+        
+        results = []
+        
+        def record(tasks: int, benchmarks) -> None:
+            for name, params, measurement in benchmarks:
+                results.append({"benchmark": name, "tasks": tasks, "params": params, **measurement})
+        
+        for size, user_id in users.items():
+            record(size, bench_get_all(db, user_id, args.repeat, args.search))
+            record(size, bench_user(db, user_id, args.repeat))
+            
+            list_results = [result for result in results if result["tasks"] == size and result["benchmark"] == "TaskRepository.get_all"]
+            slowest = max(list_results, key=lambda result: result["median_ms"])
+            print(f"\n{size} tasks")
+            print(
+                f"  {'get_all (' + str(len(list_results)) + ' combinations)':<44} "
+                f"median {statistics.median(result['median_ms'] for result in list_results):8.3f} ms, "
+                f"slowest {slowest['median_ms']:8.3f} ms {slowest['params']}"
+            )
+            for result in results[-2:]:
+                print(f"  {result['benchmark']:<44} {result['median_ms']:8.3f} ms")
+        
+        record(total_tasks, bench_scheduler(db, args.repeat))
+        record(total_tasks, bench_auth(users[args.sizes[0]], args.repeat))
+        print(f"\nAll users ({total_tasks} tasks)")
+        for result in results[-6:]:
+            label = f"{result['benchmark']} {result['params'] or ''}".strip()
+            print(f"  {label:<60} {result['median_ms']:8.3f} ms")
+    finally:
+        db.close()
+    
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "database": database,
+        "db_profile": DB_PROFILE,
+        "python": platform.python_version(),
+        "sizes": args.sizes,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+    
+    if args.compare and compare(results, args.compare, args.threshold, args.min_delta_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark task list rendering: JSON encoder and response compression
+
+Builds a realistic `GET /api/tasks` payload and measures CPU time per
+response for the stdlib JSON path (JSONResponse) and orjson (ORJSONResponse),
+plus the bytes on the wire uncompressed, gzipped and brotli-compressed.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --tasks 100 --description-length 2000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app.core import compression
+from app.schemas.schemas import TaskListResponse, TaskStatus, TaskPriority
+
+SYLLABLES = "ba be bi bo ca co de di fa fe ga go ha in ka la le li lo ma me mi mo na ne no pa pe ra re ri ro sa se si so ta te ti to va ve".split()
+
+
+def build_vocabulary(rng: random.Random, size: int = 2000) -> list[str]:
+    """Pseudo-words, repeated Zipf-style so common words dominate like real text"""
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))) for _ in range(size)]
+    return [word for rank, word in enumerate(words, start=1) for _ in range(max(1, 200 // rank))]
+
+
+def build_payload(tasks: int, description_length: int) -> TaskListResponse:
+    """A page of tasks with word-like descriptions of roughly the given length"""
+    rng = random.Random(42)
+    vocabulary = build_vocabulary(rng)
+    now = datetime(2026, 1, 1, 9, 0, 0)
+    items = []
+    for task_id in range(1, tasks + 1):
+        description = ""
+        while len(description) < description_length:
+            description += rng.choice(vocabulary) + " "
+        items.append({
+            "id": task_id,
+            "title": " ".join(rng.choice(vocabulary) for _ in range(5)).capitalize(),
+            "description": description[:description_length].strip(),
+            "status": rng.choice(list(TaskStatus)),
+            "priority": rng.choice(list(TaskPriority)),
+            "start_date": now - timedelta(days=rng.randint(0, 30)),
+            "due_date": now + timedelta(days=rng.randint(0, 30), hours=rng.randint(0, 23)),
+            "created_at": now - timedelta(days=rng.randint(30, 60)),
+            "updated_at": now - timedelta(minutes=rng.randint(0, 10000)),
+            "user_id": 1,
+        })
+    return TaskListResponse(tasks=items, total=tasks * 10, page=1, page_size=tasks, total_pages=10)
+
+
+def cpu_time_per_call(function, iterations: int) -> float:
+    """Average CPU milliseconds per call"""
+    function()
+    start = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - start) / iterations * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--description-length", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    
+    payload = build_payload(args.tasks, args.description_length)
+    # What FastAPI hands to the response class after response_model validation
+    content = jsonable_encoder(payload)
+    body = ORJSONResponse(content).body
+    
+    print(f"Task list: {args.tasks} tasks, {args.description_length}-char descriptions\n")
+    print("Render (CPU ms per response)")
+    for name, response_class in (("JSONResponse (stdlib json)", JSONResponse), ("ORJSONResponse", ORJSONResponse)):
+        ms = cpu_time_per_call(lambda: response_class(content), args.iterations)
+        print(f"  {name:<28} {ms:8.3f}")
+    
+    print("\nCompression (bytes, CPU ms per response)")
+    print(f"  {'identity':<28} {len(body):8d}")
+    for encoding, level in (("gzip", compression.GZIP_LEVEL), ("br", compression.BROTLI_QUALITY)):
+        if encoding == "br" and compression.brotli is None:
+            print("  brotli                       (not installed)")
+            continue
+        responder = compression._CompressionResponder(None, encoding, 0)
+        compressed = responder.compress(body)
+        ms = cpu_time_per_call(lambda: responder.compress(body), args.iterations)
+        label = f"{encoding} (level {level})"
+        print(f"  {label:<28} {len(compressed):8d} {ms:8.3f}   ({len(compressed) / len(body):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@
 Seed database with sample data
 """
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal, engine, Base
+from app.db.database import SessionLocal
+from app.manage import migrate
 from app.models.models import User, Task, TaskStatus, TaskPriority
 from app.core.security import get_password_hash
 from datetime import datetime, timedelta
@@ -11,8 +12,8 @@ from datetime import datetime, timedelta
 def seed_database():
     """Seed the database with sample users and tasks"""
     
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    # Bring the schema up to date
+    migrate()
     
     db = SessionLocal()
     
@@ -0,0 +1,41 @@
+"""
+Shared fixtures: the app against a throwaway, migrated SQLite database
+
+Settings are read at import time, so the environment is set up before any
+app module is imported.
+"""
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/test.db"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from app.manage import migrate
+
+migrate()
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Register a fresh user; returns their Authorization header"""
+    name = f"user_{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/auth/register", json={
+        "email": f"{name}@example.com",
+        "username": name,
+        "password": "secret123",
+    })
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,20 @@
+"""Bulk task writes keep the per-user aggregates in step with the tasks"""
+
+
+def test_delete_and_create_in_one_request_counts_the_new_task(client, auth_headers):
+    client.post("/api/tasks/", json={"title": "one"}, headers=auth_headers)
+    second = client.post("/api/tasks/", json={"title": "two", "priority": "High"}, headers=auth_headers).json()
+    
+    # SQLite hands the freed rowid to the created task
+    response = client.post("/api/tasks/bulk", json={"operations": [
+        {"op": "delete", "id": second["id"]},
+        {"op": "create", "task": {"title": "three", "status": "Completed", "priority": "Low"}},
+    ]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()["results"]] == [200, 201]
+    
+    kpis = client.get("/api/analytics/kpis", headers=auth_headers).json()
+    assert kpis["total_tasks"] == 2
+    assert kpis["completed_tasks"] == 1
+    assert kpis["not_started_tasks"] == 1
+    assert kpis["tasks_by_priority"] == {"High": 0, "Medium": 1, "Low": 1}
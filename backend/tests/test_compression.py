@@ -0,0 +1,32 @@
+"""Compressed responses carry their own strong ETag, which requests may send back"""
+
+
+def create_large_task(client, headers):
+    task = client.post("/api/tasks/", json={"title": "large", "description": "x" * 1900}, headers=headers)
+    assert task.status_code == 201
+    return task.json()["id"]
+
+
+def test_compressed_task_etag_names_its_encoding(client, auth_headers):
+    task_id = create_large_task(client, auth_headers)
+    
+    identity = client.get(f"/api/tasks/{task_id}", headers={**auth_headers, "Accept-Encoding": "identity"})
+    gzipped = client.get(f"/api/tasks/{task_id}", headers={**auth_headers, "Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+
+
+def test_compressed_etag_revalidates_and_matches(client, auth_headers):
+    task_id = create_large_task(client, auth_headers)
+    headers = {**auth_headers, "Accept-Encoding": "gzip"}
+    etag = client.get(f"/api/tasks/{task_id}", headers=headers).headers["etag"]
+    
+    not_modified = client.get(f"/api/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    
+    updated = client.put(f"/api/tasks/{task_id}", json={"title": "renamed"}, headers={**headers, "If-Match": etag})
+    assert updated.status_code == 200
+    stale = client.put(f"/api/tasks/{task_id}", json={"title": "again"}, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 412
@@ -0,0 +1,17 @@
+"""/metrics exposes internals, so it is only served with METRICS_TOKEN"""
+from app.core.config import settings
+
+
+def test_metrics_disabled_without_token_setting(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_requires_the_token(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-secret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers=auth_headers).status_code == 401
+    
+    response = client.get("/metrics", headers={"Authorization": "Bearer metrics-secret"})
+    assert response.status_code == 200
+    assert set(response.json()) == {"token_cache", "response_cache", "database"}